@@ -3,7 +3,7 @@
 #
 # IAToolkit is open source software.
 
-from sqlalchemy import  text
+from sqlalchemy import  text, insert
 from injector import inject
 from iatoolkit.common.exceptions import IAToolkitException
 from iatoolkit.repositories.database_manager import DatabaseManager
@@ -13,6 +13,9 @@ import logging
 
 
 class VSRepo:
+    # max number of chunks sent in each multi-row INSERT
+    INSERT_BATCH_SIZE = 256
+
     @inject
     def __init__(self,
                  db_manager: DatabaseManager,
@@ -23,10 +26,18 @@ class VSRepo:
 
     def add_document(self, company_short_name, vs_chunk_list: list[VSDoc]):
         try:
+            rows = []
             for doc in vs_chunk_list:
                 # calculate the embedding for the text
                 doc.embedding = self.embedding_service.embed_text(company_short_name, doc.text)
-                self.session.add(doc)
+                rows.append({'company_id': doc.company_id,
+                             'document_id': doc.document_id,
+                             'text': doc.text,
+                             'embedding': doc.embedding})
+
+            # bulk insert: one executemany statement per batch instead of one INSERT per chunk
+            for i in range(0, len(rows), self.INSERT_BATCH_SIZE):
+                self.session.execute(insert(VSDoc), rows[i:i + self.INSERT_BATCH_SIZE])
             self.session.commit()
         except Exception as e:
             logging.error(f"Error while inserting embedding chunk list: {str(e)}")
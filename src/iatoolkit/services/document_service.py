@@ -26,10 +26,10 @@ class DocumentService:
             if filename.lower().endswith('.docx'):
                 return self.read_docx(file_content)
             elif filename.lower().endswith('.txt') or filename.lower().endswith('.md'):
-                if isinstance(file_content, bytes):
+                if isinstance(file_content, (bytes, bytearray, memoryview)):
                     try:
-                        # decode using UTF-8
-                        file_content = file_content.decode('utf-8')
+                        # decode using UTF-8, straight from the buffer without copying it
+                        file_content = str(file_content, 'utf-8')
                     except UnicodeDecodeError:
                         raise IAToolkitException(IAToolkitException.ErrorType.FILE_FORMAT_ERROR,
                                            self.i18n_service.t('errors.services.no_text_file'))
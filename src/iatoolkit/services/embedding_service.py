@@ -6,8 +6,6 @@ import os
 import base64
 import numpy as np
 from threading import Lock
-from huggingface_hub import InferenceClient
-from openai import OpenAI
 from injector import inject
 from iatoolkit.services.configuration_service import ConfigurationService
 from iatoolkit.services.i18n_service import I18nService
@@ -50,6 +48,7 @@ class EmbeddingClientFactory:
     def __init__(self, config_service: ConfigurationService):
         self.config_service = config_service
         self._clients = {}  # Cache for storing initialized client wrappers
+        self._env_cache: dict[str, str] = {}  # Cache for resolved api keys
 
     def get_client(self, company_short_name: str) -> EmbeddingClientWrapper:
         """
@@ -73,18 +72,22 @@ class EmbeddingClientFactory:
         if not api_key_name:
             raise ValueError(f"Missiong configuration for embedding_provider:api_key_name en config.yaml.")
 
-        api_key = os.getenv(api_key_name)
+        api_key = self._env_cache.get(api_key_name) or os.getenv(api_key_name)
         if not api_key:
             raise ValueError(f"Environment variable '{api_key_name}' is not set.")
+        self._env_cache[api_key_name] = api_key
 
         # Logic to handle multiple providers
         wrapper = None
         if provider == 'huggingface':
             if not model:
                 model='sentence-transformers/all-MiniLM-L6-v2'
+            # SDKs are imported lazily so only the configured provider is loaded
+            from huggingface_hub import InferenceClient
             client = InferenceClient(model=model, token=api_key)
             wrapper = HuggingFaceClientWrapper(client, model)
         elif provider == 'openai':
+            from openai import OpenAI
             client = OpenAI(api_key=api_key)
             if not model:
                 model='text-embedding-ada-002'
@@ -112,10 +115,21 @@ class EmbeddingService:
         self.profile_repo = profile_repo
 
 
-    def embed_text(self, company_short_name: str, text: str, to_base64: bool = False) -> list[float] | str:
+    def embed_text(self,
+                   company_short_name: str,
+                   text: str,
+                   to_base64: bool = False,
+                   dtype: str = 'float32') -> list[float] | str:
         """
         Generates the embedding for a given text using the appropriate company model.
+
+        When to_base64 is True, the vector is serialized as little-endian floats of the
+        given dtype ('float32' or 'float16'). float16 halves the payload size, at the cost
+        of a small loss of precision (typically negligible for similarity search).
         """
+        if dtype not in ('float32', 'float16'):
+            raise ValueError(f"Unsupported embedding dtype '{dtype}': use 'float32' or 'float16'")
+
         try:
             company = self.profile_repo.get_company_by_short_name(company_short_name)
             if not company:
@@ -128,7 +142,8 @@ class EmbeddingService:
             embedding = client_wrapper.get_embedding(text)
             # 3. Process the result
             if to_base64:
-                return base64.b64encode(np.array(embedding, dtype=np.float32).tobytes()).decode('utf-8')
+                wire_dtype = np.dtype(dtype).newbyteorder('<')
+                return base64.b64encode(np.asarray(embedding, dtype=wire_dtype).tobytes()).decode('utf-8')
 
             return embedding
         except Exception as e:
@@ -5,6 +5,7 @@
 
 import pytest
 import os
+from unittest.mock import MagicMock
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -34,3 +35,27 @@ def setup_test_environment():
     # Restaurar estado original
     os.environ.clear()
     os.environ.update(original_environ)
+
+
+@pytest.fixture(scope="session")
+def spec_mock_cache():
+    """Attribute names of the classes handed to spec_mock, read once per session and keyed by class."""
+    return {}
+
+
+@pytest.fixture
+def spec_mock(spec_mock_cache):
+    """
+    Returns a new MagicMock specced against a class (a service, a repository or an ORM
+    model). Reading the spec walks the whole class, so its attribute names are computed
+    once per class and reused; each call still builds its own mock, so nothing set on
+    it leaks into other tests.
+    """
+    def get(cls):
+        names = spec_mock_cache.get(cls)
+        if names is None:
+            names = spec_mock_cache[cls] = dir(cls)
+        mock = MagicMock(spec=names)
+        mock.__class__ = cls    # isinstance checks pass, as with spec=cls
+        return mock
+    return get
@@ -11,21 +11,45 @@ from iatoolkit.common.exceptions import IAToolkitException
 import base64
 
 
+class _QueryStub:
+    """Minimal stand-in for a SQLAlchemy query: filter_by() chains and first() returns a preset value."""
+    def __init__(self, first_val=None):
+        self.first_val = first_val
+
+    def filter_by(self, **kwargs):
+        return self
+
+    def first(self):
+        return self.first_val
+
+
 class TestDocumentRepo:
-    def setup_method(self):
+    @pytest.fixture(scope="class", autouse=True)
+    def repo_setup(self, request):
+        """Builds the mocked session, the repo and the test models once for the whole class."""
+        cls = request.cls
         # Mock the DatabaseManager
-        self.mock_db_manager = MagicMock()
-        self.session = self.mock_db_manager.get_session()
+        cls.session = MagicMock()
+        cls.mock_db_manager = MagicMock()
+        cls.mock_db_manager.get_session.return_value = cls.session
+        cls.query = _QueryStub()
+        cls.session.query.return_value = cls.query
 
         # Initialize DocumentRepo with the mocked DatabaseManager
-        self.repo = DocumentRepo(self.mock_db_manager)
-        self.mock_document = Document(company_id=1,
-                                 filename='test.txt',
-                                 content='123',
-                                 content_b64=base64.b64encode('123'.encode('utf-8')).decode('utf-8'),
-                                 meta={'repertorio_id': 10})
-        self.mock_company = Company(name='company')
-
+        cls.repo = DocumentRepo(cls.mock_db_manager)
+        cls.mock_document = Document(company_id=1,
+                                     filename='test.txt',
+                                     content='123',
+                                     content_b64=base64.b64encode('123'.encode('utf-8')).decode('utf-8'),
+                                     meta={'repertorio_id': 10})
+        cls.mock_company = Company(name='company')
+
+    @pytest.fixture(autouse=True)
+    def reset_session(self):
+        """Clears the calls, return values and side effects left on the session by the previous test."""
+        self.session.reset_mock(return_value=True, side_effect=True)
+        self.session.query.return_value = self.query
+        self.query.first_val = None
 
     def test_insert_when_ok(self):
         self.repo.insert(self.mock_document)
@@ -42,7 +66,7 @@ class TestDocumentRepo:
         assert exc_info.value.error_type == IAToolkitException.ErrorType.PARAM_NOT_FILLED
 
     def test_get_document_by_filename(self):
-        self.session.query.return_value.filter_by.return_value.first.return_value = self.mock_document
+        self.query.first_val = self.mock_document
 
         # Act
         result = self.repo.get(self.mock_company, filename="test_file.txt")
@@ -58,15 +82,13 @@ class TestDocumentRepo:
         self.session.query.assert_not_called()
 
     def test_get_by_id_when_document_not_found(self):
-        self.session.query.return_value.filter_by.return_value.first.return_value = None
-
         result = self.repo.get_by_id(999)
 
         assert result is None
         self.session.query.assert_called()
 
     def test_get_by_id_when_document_exists(self):
-        self.session.query.return_value.filter_by.return_value.first.return_value = self.mock_document
+        self.query.first_val = self.mock_document
 
         result = self.repo.get_by_id(1)
 
@@ -50,11 +50,27 @@ class TestVSRepo:
         ]
         self.mock_embedding_service.embed_text.assert_has_calls(expected_calls)
 
-        # Check database interactions
-        assert self.mock_session.add.call_count == 2
+        # Check database interactions: a single bulk insert with one row per chunk
+        self.mock_session.execute.assert_called_once()
+        rows = self.mock_session.execute.call_args.args[1]
+        assert [row['text'] for row in rows] == ["Documento de prueba 1", "Documento de prueba 2"]
+        assert all(row['embedding'] == self.MOCK_EMBEDDING_VECTOR for row in rows)
+        self.mock_session.add.assert_not_called()
         self.mock_session.commit.assert_called_once()
         self.mock_session.rollback.assert_not_called()
 
+    def test_add_document_inserts_in_batches(self, monkeypatch):
+        """Tests that the chunks are split in one INSERT statement per batch."""
+        monkeypatch.setattr(VSRepo, 'INSERT_BATCH_SIZE', 2)
+        vs_chunk_list = [VSDoc(company_id=1, document_id=7, text=f"chunk {i}") for i in range(5)]
+
+        self.vs_repo.add_document(self.MOCK_COMPANY_SHORT_NAME, vs_chunk_list)
+
+        assert self.mock_session.execute.call_count == 3
+        batch_sizes = [len(c.args[1]) for c in self.mock_session.execute.call_args_list]
+        assert batch_sizes == [2, 2, 1]
+        self.mock_session.commit.assert_called_once()
+
     def test_add_document_rollback_on_embedding_error(self):
         """Tests that a DB rollback occurs if the embedding service fails."""
         # Arrange
@@ -0,0 +1,19 @@
+# Copyright (c) 2024 Fernando Libedinsky
+# Product: IAToolkit
+#
+# IAToolkit is open source software.
+
+from unittest.mock import MagicMock
+
+
+class StubDocRepo:
+    """Minimal stand-in for DocumentRepo exposing only what LoadDocumentsService touches."""
+    def __init__(self):
+        self.session = MagicMock()
+        self.get = MagicMock(return_value=None)
+
+
+class StubVSRepo:
+    """Minimal stand-in for VSRepo exposing only what LoadDocumentsService touches."""
+    def __init__(self):
+        self.add_document = MagicMock()
@@ -2,11 +2,12 @@
 # Product: IAToolkit
 
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 from injector import Injector
 from iatoolkit.base_company import BaseCompany
 from iatoolkit.company_registry import get_company_registry, register_company
 from iatoolkit.services.dispatcher_service import Dispatcher
+from iatoolkit.iatoolkit import IAToolkit
 from iatoolkit.common.exceptions import IAToolkitException
 from iatoolkit.repositories.llm_query_repo import LLMQueryRepo
 from iatoolkit.repositories.profile_repo import ProfileRepo
@@ -31,23 +32,22 @@ class MockSampleCompany(BaseCompany):
 
 class TestDispatcher:
     @pytest.fixture(autouse=True)
-    def setup(self):
+    def setup(self, spec_mock, monkeypatch):
         """Set up mocks, registry, and the Dispatcher for tests."""
         # Clean up the registry before each test to prevent interference
         registry = get_company_registry()
         registry.clear()
 
-        # Mocks for services that are injected into the Dispatcher
-        self.mock_prompt_manager = MagicMock(spec=PromptService)
-        self.profile_service = MagicMock(spec=ProfileService)
-        self.mock_llm_query_repo = MagicMock(spec=LLMQueryRepo)
-        self.excel_service = MagicMock(spec=ExcelService)
-        self.mail_service = MagicMock(spec=MailService)
-        self.util = MagicMock(spec=Utility)
-        self.mock_profile_repo = MagicMock(spec=ProfileRepo)
-        self.mock_config_service = MagicMock(spec=ConfigurationService)
-        self.mock_sql_service = MagicMock(spec=SqlService)
-
+        # Mocks for services that are injected into the Dispatcher, specced by spec_mock
+        self.mock_prompt_manager = spec_mock(PromptService)
+        self.profile_service = spec_mock(ProfileService)
+        self.mock_llm_query_repo = spec_mock(LLMQueryRepo)
+        self.excel_service = spec_mock(ExcelService)
+        self.mail_service = spec_mock(MailService)
+        self.util = spec_mock(Utility)
+        self.mock_profile_repo = spec_mock(ProfileRepo)
+        self.mock_config_service = spec_mock(ConfigurationService)
+        self.mock_sql_service = spec_mock(SqlService)
 
         # Create a mock injector that will be used for instantiation.
         mock_injector = Injector()
@@ -61,9 +61,8 @@ class TestDispatcher:
 
         # Patch IAToolkit.get_instance() to return our mock toolkit. This must be active
         # BEFORE any code that depends on the IAToolkit singleton is run.
-        self.get_instance_patcher = patch('iatoolkit.iatoolkit.IAToolkit.get_instance',
-                                          return_value=self.toolkit_mock)
-        self.get_instance_patcher.start()
+        # monkeypatch undoes it after the test, with the rest of the fixture cleanup.
+        monkeypatch.setattr(IAToolkit, 'get_instance', MagicMock(return_value=self.toolkit_mock))
 
         # Now we can safely instantiate our mock company.
         self.mock_sample_company_instance = MockSampleCompany()
@@ -96,13 +95,9 @@ class TestDispatcher:
             sql_service=self.mock_sql_service
         )
 
-    def teardown_method(self, method):
-        """Clean up patches after each test."""
-        if hasattr(self, 'get_instance_patcher'):
-            self.get_instance_patcher.stop()
+        yield
 
         # Clean up the registry
-        registry = get_company_registry()
         registry.clear()
 
     def test_dispatch_sample_company(self):
@@ -111,22 +106,22 @@ class TestDispatcher:
         self.mock_sample_company_instance.handle_request.assert_called_once_with("some_data", key='a value')
         assert result == {"result": "sample_company_response"}
 
-    def test_dispatch_invalid_company(self):
-        """Tests that dispatch raises an exception for an unconfigured company."""
-        with pytest.raises(IAToolkitException) as excinfo:
-            self.dispatcher.dispatch("invalid_company", "some_tag")
-        assert "Empresa 'invalid_company' no configurada" in str(excinfo.value)
+    @pytest.mark.parametrize("method, args, expected_message", [
+        ("dispatch", ("invalid_company", "some_tag"), "Empresa 'invalid_company' no configurada"),
+        ("get_user_info", ("invalid_company", "any_user"), "company not configured: invalid_company"),
+    ])
+    def test_invalid_company(self, method, args, expected_message):
+        """Tests that the dispatcher raises an exception for an unconfigured company."""
+        with pytest.raises(IAToolkitException, match=expected_message):
+            getattr(self.dispatcher, method)(*args)
 
     def test_dispatch_method_exception(self):
         """Validates that the dispatcher handles exceptions thrown by companies."""
         self.mock_sample_company_instance.handle_request.side_effect = Exception("Method error")
 
-        with pytest.raises(IAToolkitException) as excinfo:
+        with pytest.raises(IAToolkitException, match="Error en function call 'some_data': Method error"):
             self.dispatcher.dispatch("sample", "some_data")
 
-        assert "Error en function call 'some_data'" in str(excinfo.value)
-        assert "Method error" in str(excinfo.value)
-
     def test_dispatch_system_function(self):
         """Tests that dispatch correctly handles system functions."""
         self.excel_service.excel_generator.return_value = {"file": "test.xlsx"}
@@ -161,21 +156,14 @@ class TestDispatcher:
     def test_get_user_info_external_user_company_exception(self):
         """Tests get_user_info for an external user when the company method fails."""
         self.mock_sample_company_instance.get_user_info.side_effect = Exception("DB error")
-        with pytest.raises(IAToolkitException) as excinfo:
+        with pytest.raises(IAToolkitException, match="Error in get_user_info"):
             self.dispatcher.get_user_info("sample", "ext_user_123")
-        assert "Error in get_user_info" in str(excinfo.value)
-
-    def test_get_user_info_invalid_company(self):
-        """Tests get_user_info with an invalid company."""
-        with pytest.raises(IAToolkitException) as excinfo:
-            self.dispatcher.get_user_info("invalid_company", "any_user")
-        assert 'company not configured: invalid_company' in str(excinfo.value)
 
-    def test_get_company_services(self):
+    def test_get_company_services(self, spec_mock):
         """Tests that get_company_services returns a correctly formatted list of tools."""
         # Mock Company and Function objects
-        mock_company = MagicMock(spec=Company)
-        mock_function = MagicMock(spec=Function)
+        mock_company = spec_mock(Company)
+        mock_function = spec_mock(Function)
         mock_function.name = "test_function"
         mock_function.description = "A test function"
         mock_function.parameters = {"type": "object", "properties": {}}
@@ -193,34 +181,27 @@ class TestDispatcher:
         assert tool["parameters"]["additionalProperties"] is False
         assert tool["strict"] is True
 
-    def test_dispatcher_with_no_companies_registered(self):
+    def test_dispatcher_with_no_companies_registered(self, monkeypatch):
         """Tests that the dispatcher works if no company is registered."""
-        # Stop the current patch first
-        self.get_instance_patcher.stop()
-
         # Clean registry
         get_company_registry().clear()
 
         toolkit_mock = MagicMock()
         toolkit_mock.get_injector.return_value = Injector()  # Empty injector
 
-        # Start a new patch for this specific test
-        with patch('iatoolkit.iatoolkit.IAToolkit.get_instance', return_value=toolkit_mock):
-            dispatcher = Dispatcher(
-                prompt_service=self.mock_prompt_manager,
-                llmquery_repo=self.mock_llm_query_repo,
-                util=self.util,
-                excel_service=self.excel_service,
-                mail_service=self.mail_service,
-                config_service=self.mock_config_service,
-                sql_service=self.mock_sql_service
-            )
-
-            assert len(dispatcher.company_instances) == 0
-
-            with pytest.raises(IAToolkitException) as excinfo:
-                dispatcher.dispatch("any_company", "some_action")
-            assert "Empresa 'any_company' no configurada" in str(excinfo.value)
-
-        # Restart the main patch for subsequent tests
-        self.get_instance_patcher.start()
\ No newline at end of file
+        # Replace the toolkit patched in setup; monkeypatch restores everything after the test
+        monkeypatch.setattr(IAToolkit, 'get_instance', MagicMock(return_value=toolkit_mock))
+        dispatcher = Dispatcher(
+            prompt_service=self.mock_prompt_manager,
+            llmquery_repo=self.mock_llm_query_repo,
+            util=self.util,
+            excel_service=self.excel_service,
+            mail_service=self.mail_service,
+            config_service=self.mock_config_service,
+            sql_service=self.mock_sql_service
+        )
+
+        assert len(dispatcher.company_instances) == 0
+
+        with pytest.raises(IAToolkitException, match="Empresa 'any_company' no configurada"):
+            dispatcher.dispatch("any_company", "some_action")
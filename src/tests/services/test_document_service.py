@@ -33,6 +33,10 @@ class TestDocumentService:
         result = self.service.file_to_txt("test.txt", b"dummy_content")
         assert result == "dummy_content"
 
+    def test_file_txt_when_memoryview_content(self):
+        result = self.service.file_to_txt("test.txt", memoryview(b"dummy_content"))
+        assert result == "dummy_content"
+
     def test_file_txt_when_binary_content_and_error_decoding(self):
         with pytest.raises(IAToolkitException) as excinfo:
             result = self.service.file_to_txt("test.txt", b'\xff\xfe\xff'
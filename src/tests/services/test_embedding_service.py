@@ -4,6 +4,10 @@ import pytest
 from unittest.mock import Mock, MagicMock, patch, call
 import numpy as np
 import base64
+# the factory imports the SDKs lazily; loading them here, before any test patches the
+# environment, keeps their import-time settings (hub endpoint, cache dir) untouched
+from huggingface_hub import InferenceClient
+from openai import OpenAI
 from iatoolkit.repositories.models import Company
 
 # Import the classes to be tested, including the new wrappers
@@ -70,10 +74,10 @@ class TestEmbeddingService:
 
     # --- Factory Tests ---
 
-    def test_factory_creates_huggingface_wrapper(self, mocker):
+    def test_factory_creates_huggingface_wrapper(self, mocker, monkeypatch):
         """Tests that the factory correctly creates a HuggingFaceClientWrapper."""
-        mocker.patch('os.getenv', return_value='fake-hf-key')
-        mock_hf_client_class = mocker.patch('iatoolkit.services.embedding_service.InferenceClient')
+        monkeypatch.setenv('HF_KEY', 'fake-hf-key')
+        mock_hf_client_class = mocker.patch('huggingface_hub.InferenceClient')
 
         # Act
         wrapper = self.client_factory.get_client('company_hf')
@@ -83,10 +87,10 @@ class TestEmbeddingService:
         mock_hf_client_class.assert_called_once_with(model='hf-model', token='fake-hf-key')
         assert wrapper.model == 'hf-model'
 
-    def test_factory_creates_openai_wrapper(self, mocker):
+    def test_factory_creates_openai_wrapper(self, mocker, monkeypatch):
         """Tests that the factory correctly creates an OpenAIClientWrapper."""
-        mocker.patch('os.getenv', return_value='fake-openai-key')
-        mock_openai_client_class = mocker.patch('iatoolkit.services.embedding_service.OpenAI')
+        monkeypatch.setenv('OPENAI_KEY', 'fake-openai-key')
+        mock_openai_client_class = mocker.patch('openai.OpenAI')
 
         # Act
         wrapper = self.client_factory.get_client('company_openai')
@@ -96,10 +100,10 @@ class TestEmbeddingService:
         mock_openai_client_class.assert_called_once_with(api_key='fake-openai-key')
         assert wrapper.model == 'openai-model'
 
-    def test_factory_returns_cached_wrapper(self, mocker):
+    def test_factory_returns_cached_wrapper(self, mocker, monkeypatch):
         """Tests that the factory caches the wrapper instance on subsequent calls."""
-        mocker.patch('os.getenv', return_value='fake-key')
-        mock_hf_client_class = mocker.patch('iatoolkit.services.embedding_service.InferenceClient')
+        monkeypatch.setenv('HF_KEY', 'fake-key')
+        mock_hf_client_class = mocker.patch('huggingface_hub.InferenceClient')
 
         # Act
         wrapper1 = self.client_factory.get_client('company_hf')
@@ -109,12 +113,25 @@ class TestEmbeddingService:
         mock_hf_client_class.assert_called_once()  # The underlying client should only be created once
         assert wrapper1 is wrapper2  # The returned wrapper must be the same object instance
 
-    def test_factory_raises_error_if_api_key_is_not_set(self, mocker):
+    def test_factory_raises_error_if_api_key_is_not_set(self, monkeypatch):
         """Tests that a ValueError is raised if the API key environment variable is missing."""
-        mocker.patch('os.getenv', return_value=None)
+        monkeypatch.delenv('HF_KEY', raising=False)
         with pytest.raises(ValueError, match="Environment variable 'HF_KEY' is not set"):
             self.client_factory.get_client('company_hf')
 
+    def test_factory_reuses_cached_api_key(self, mocker):
+        """Tests that the api key is read from the environment only once per key name."""
+        mock_getenv = mocker.patch('os.getenv', return_value='fake-key')
+        mocker.patch('huggingface_hub.InferenceClient')
+
+        # Act
+        self.client_factory.get_client('company_hf')
+        self.client_factory._clients.clear()
+        self.client_factory.get_client('company_hf')
+
+        # Assert
+        mock_getenv.assert_called_once_with('HF_KEY')
+
     # --- Service Tests (Provider Agnostic) ---
 
     def test_service_embed_text_returns_vector(self, mocker):
@@ -155,6 +172,36 @@ class TestEmbeddingService:
         assert result == expected_base64
         mock_wrapper.get_embedding.assert_called_once_with("some text")
 
+    def test_service_embed_text_returns_base64_fp16(self, mocker):
+        """
+        Tests that embed_text serializes the vector as float16 when requested,
+        halving the size of the base64 payload.
+        """
+        # Arrange
+        mock_wrapper = MagicMock(spec=EmbeddingClientWrapper)
+        mock_wrapper.get_embedding.return_value = self.SAMPLE_VECTOR
+        mocker.patch.object(self.client_factory, 'get_client', return_value=mock_wrapper)
+
+        # Act
+        result = self.embedding_service.embed_text("any_company", "some text", to_base64=True, dtype='float16')
+
+        # Assert
+        raw = base64.b64decode(result)
+        assert len(raw) == 2 * len(self.SAMPLE_VECTOR)
+        np.testing.assert_allclose(np.frombuffer(raw, dtype='<f2'), self.SAMPLE_VECTOR, rtol=1e-3)
+
+    def test_service_embed_text_rejects_unsupported_dtype(self, mocker):
+        """
+        Tests that embed_text rejects a dtype other than float32 or float16
+        before asking the client for an embedding.
+        """
+        mock_get_client = mocker.patch.object(self.client_factory, 'get_client')
+
+        with pytest.raises(ValueError, match="Unsupported embedding dtype 'int8'"):
+            self.embedding_service.embed_text("any_company", "some text", to_base64=True, dtype='int8')
+
+        mock_get_client.assert_not_called()
+
     def test_service_get_model_name(self, mocker):
         """
         Tests that get_model_name returns the model name from the wrapper.
@@ -1,11 +1,35 @@
 # tests/services/test_language_service.py
 import pytest
+from dataclasses import dataclass
 from flask import Flask, g
 from unittest.mock import MagicMock, patch, call
 from iatoolkit.services.language_service import LanguageService
 from iatoolkit.services.configuration_service import ConfigurationService
 from iatoolkit.repositories.profile_repo import ProfileRepo
-from iatoolkit.repositories.models import User
+
+
+@dataclass(frozen=True, slots=True)
+class _UserStub:
+    """Plain stand-in for the User model; ProfileRepo is mocked, so no ORM state is needed."""
+    id: int
+    email: str
+    preferred_language: str | None = None
+
+
+@pytest.fixture(scope="module")
+def app():
+    """
+    Flask app shared by all tests in this module.
+    The URL map is built once; each test only opens its own request context.
+    """
+    app = Flask(__name__)
+
+    # Register a dummy route to correctly parse `company_short_name` from URLs.
+    @app.route('/<company_short_name>/login')
+    def dummy_route_for_test(company_short_name):
+        return "ok"
+
+    return app
 
 
 class TestLanguageService:
@@ -14,28 +38,23 @@ class TestLanguageService:
     """
 
     @pytest.fixture(autouse=True)
-    def setup_method(self):
+    def setup_method(self, app):
         """
         Pytest fixture that runs before each test.
         - Mocks dependencies: ProfileRepo and ConfigurationService.
         - Creates a fresh instance of LanguageService.
-        - Creates a Flask app to provide a request context.
+        - Reuses the module-scoped Flask app to provide a request context.
         """
         self.mock_profile_repo = MagicMock(spec=ProfileRepo)
         self.mock_config_service = MagicMock(spec=ConfigurationService)
         self.language_service = LanguageService(config_service=self.mock_config_service,
                                                 profile_repo=self.mock_profile_repo)
 
-        self.app = Flask(__name__)
+        self.app = app
 
         # Mock user objects for predictable test data
-        self.user_with_lang_de = User(id=1, email='user-de@acme.com', preferred_language='de')
-        self.user_without_lang = User(id=2, email='user-no-lang@acme.com', preferred_language=None)
-
-        # Register a dummy route to correctly parse `company_short_name` from URLs.
-        @self.app.route('/<company_short_name>/login')
-        def dummy_route_for_test(company_short_name):
-            return "ok"
+        self.user_with_lang_de = _UserStub(id=1, email='user-de@acme.com', preferred_language='de')
+        self.user_without_lang = _UserStub(id=2, email='user-no-lang@acme.com')
 
     # --- Priority 1 Tests: User Preference ---
 
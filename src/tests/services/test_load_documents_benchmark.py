@@ -0,0 +1,43 @@
+# tests/services/test_load_documents_benchmark.py
+
+import pytest
+from iatoolkit.services.load_documents_service import LoadDocumentsService
+from iatoolkit.services.configuration_service import ConfigurationService
+from iatoolkit.infra.connectors.file_connector_factory import FileConnectorFactory
+from iatoolkit.services.document_service import DocumentService
+from iatoolkit.repositories.models import Company
+from ._stubs import StubDocRepo, StubVSRepo
+
+# benchmarks only run where pytest-benchmark is installed, as in the CI
+pytest.importorskip("pytest_benchmark")
+
+# a document large enough to be split in several chunks
+DOCUMENT_TEXT = "Cláusula de ejemplo para el contrato de prueba. " * 200
+DOCUMENT_CONTENT = DOCUMENT_TEXT.encode("utf-8")
+CONTEXT = {'metadata': {'category': 'legal'}}
+
+
+@pytest.fixture(scope="module")
+def company():
+    return Company(id=1, short_name='acme')
+
+
+@pytest.fixture
+def service(spec_mock):
+    doc_service = spec_mock(DocumentService)
+    doc_service.file_to_txt.return_value = DOCUMENT_TEXT
+    return LoadDocumentsService(
+        config_service=spec_mock(ConfigurationService),
+        file_connector_factory=spec_mock(FileConnectorFactory),
+        doc_service=doc_service,
+        doc_repo=StubDocRepo(),
+        vector_store=StubVSRepo(),
+    )
+
+
+def test_bench_file_processing_callback(benchmark, service, company):
+    """Success path of the per-file load: text extraction, Document, chunking and vector store."""
+    document = benchmark(service._file_processing_callback, company, 'contract.pdf', DOCUMENT_CONTENT, CONTEXT)
+
+    assert document.filename == 'contract.pdf'
+    assert document.meta == {'category': 'legal'}
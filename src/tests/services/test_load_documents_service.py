@@ -6,10 +6,9 @@ from iatoolkit.services.load_documents_service import LoadDocumentsService
 from iatoolkit.services.configuration_service import ConfigurationService
 from iatoolkit.infra.connectors.file_connector_factory import FileConnectorFactory
 from iatoolkit.services.document_service import DocumentService
-from iatoolkit.repositories.document_repo import DocumentRepo
-from iatoolkit.repositories.vs_repo import VSRepo
 from iatoolkit.repositories.models import Company, Document
 from iatoolkit.common.exceptions import IAToolkitException
+from ._stubs import StubDocRepo, StubVSRepo
 
 # Mock configuration to simulate the 'knowledge_base' section of company.yaml
 MOCK_KNOWLEDGE_BASE_CONFIG = {
@@ -26,18 +25,20 @@ MOCK_KNOWLEDGE_BASE_CONFIG = {
 
 class TestLoadDocumentsService:
 
+    @pytest.fixture(scope="module")
+    def company(self):
+        """Company shared by the whole module; no test modifies it."""
+        return Company(id=1, short_name='acme')
+
     @pytest.fixture(autouse=True)
-    def setup_method(self):
+    def setup_method(self, spec_mock, company):
         """Set up mocks for all dependencies and instantiate the service."""
-        self.mock_config_service = MagicMock(spec=ConfigurationService)
-        self.mock_file_connector_factory = MagicMock(spec=FileConnectorFactory)
-        self.mock_doc_service = MagicMock(spec=DocumentService)
-        self.mock_doc_repo = MagicMock(spec=DocumentRepo)
-        self.mock_vector_store = MagicMock(spec=VSRepo)
-
-        # SOLUCIÓN: Crear un mock para 'session' y adjuntarlo al mock del repositorio.
-        self.mock_session = MagicMock()
-        self.mock_doc_repo.session = self.mock_session
+        self.mock_config_service = spec_mock(ConfigurationService)
+        self.mock_file_connector_factory = spec_mock(FileConnectorFactory)
+        self.mock_doc_service = spec_mock(DocumentService)
+        self.mock_doc_repo = StubDocRepo()
+        self.mock_vector_store = StubVSRepo()
+        self.mock_session = self.mock_doc_repo.session
 
         self.service = LoadDocumentsService(
             config_service=self.mock_config_service,
@@ -46,7 +47,7 @@ class TestLoadDocumentsService:
             doc_repo=self.mock_doc_repo,
             vector_store=self.mock_vector_store,
         )
-        self.company = Company(id=1, short_name='acme')
+        self.company = company
 
     def test_load_sources_raises_exception_if_knowledge_base_config_is_missing(self):
         self.mock_config_service.get_configuration.return_value = None
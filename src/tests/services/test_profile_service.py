@@ -3,6 +3,7 @@
 
 import pytest
 from unittest.mock import MagicMock, patch
+from iatoolkit.services import profile_service
 from iatoolkit.services.profile_service import ProfileService
 from iatoolkit.services.user_session_context_service import UserSessionContextService
 from iatoolkit.services.configuration_service import ConfigurationService
@@ -13,8 +14,27 @@ from flask_bcrypt import generate_password_hash
 from iatoolkit.services.dispatcher_service import Dispatcher
 from iatoolkit.services.i18n_service import I18nService
 
-# The SessionManager is used inside the 'profile_service' module.
-@patch('iatoolkit.services.profile_service.SessionManager')
+# bcrypt is deliberately slow, so the password of the test user is hashed once for the whole module
+MOCK_PASSWORD_HASH = generate_password_hash("password").decode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def shared_session_manager():
+    """The SessionManager used inside the 'profile_service' module, replaced once for the whole module."""
+    mock = MagicMock()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(profile_service, "SessionManager", mock)
+        yield mock
+
+
+@pytest.fixture
+def mock_session_manager(shared_session_manager):
+    """The shared SessionManager mock, cleared of the calls and values of the previous test."""
+    shared_session_manager.reset_mock(return_value=True, side_effect=True)
+    return shared_session_manager
+
+
+@pytest.mark.usefixtures("mock_session_manager")
 class TestProfileService:
 
     @pytest.fixture(autouse=True)
@@ -37,7 +57,7 @@ class TestProfileService:
         )
 
         self.mock_user = User(id=1, email='test@email.com', first_name='Test', last_name='User',
-                              password=generate_password_hash("password").decode("utf-8"), verified=True)
+                              password=MOCK_PASSWORD_HASH, verified=True)
         self.mock_company = Company(id=100, name='My Company', short_name='test_company')
         self.mock_repo.get_company_by_short_name.return_value = self.mock_company
         self.mock_repo.get_user_by_email.return_value = self.mock_user
@@ -78,13 +98,12 @@ class TestProfileService:
 
     def test_get_current_session_info(self, mock_session_manager):
         """Tests get_current_session_info reads from Flask cookie and fetches from Redis."""
-        # This context is needed because SessionManager.get touches the real Flask `session` object.
-        with patch('iatoolkit.services.profile_service.SessionManager', mock_session_manager):
-            mock_session_manager.get.side_effect = lambda key: '1' if key == 'user_identifier' else 'testco'
-            expected_profile = {"id": 1, "email": "test@email.com"}
-            self.mock_session_context.get_profile_data.return_value = expected_profile
+        # The mock is needed because SessionManager.get touches the real Flask `session` object.
+        mock_session_manager.get.side_effect = lambda key: '1' if key == 'user_identifier' else 'testco'
+        expected_profile = {"id": 1, "email": "test@email.com"}
+        self.mock_session_context.get_profile_data.return_value = expected_profile
 
-            result = self.service.get_current_session_info()
+        result = self.service.get_current_session_info()
 
         self.mock_session_context.get_profile_data.assert_called_once_with('testco', '1')
         assert result['profile'] == expected_profile
@@ -109,7 +128,7 @@ class TestProfileService:
         assert  response['error'] == 'translated:errors.signup.user_already_registered'
 
     def test_signup_when_user_exist_and_invalid_password(self, mock_session_manager):
-        self.mock_user.password = generate_password_hash("password").decode("utf-8")
+        self.mock_user.password = MOCK_PASSWORD_HASH
         self.mock_repo.get_user_by_email.return_value = self.mock_user
 
         response = self.service.signup(
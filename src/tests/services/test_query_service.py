@@ -2,8 +2,7 @@
 # Product: IAToolkit
 
 import pytest
-from unittest.mock import MagicMock, patch
-import os
+from unittest.mock import Mock, patch
 import base64
 from iatoolkit.services.query_service import QueryService
 from iatoolkit.services.prompt_manager_service import PromptService
@@ -23,6 +22,32 @@ MOCK_COMPANY_SHORT_NAME = "test_company"
 MOCK_LOCAL_USER_ID = 1
 MOCK_EXTERNAL_USER_ID = "ext-user-abc"
 
+# company shared by the whole module; no test modifies it
+MOCK_COMPANY = Company(id=1, short_name=MOCK_COMPANY_SHORT_NAME)
+
+# Base64 content for file loading tests, encoded once for the whole module
+MOCK_DOCUMENT_BASE64 = base64.b64encode(b'document content').decode('utf-8')
+
+# attached files for the load_files_for_context tests; the service only reads them
+MOCK_PDF_FILES = [{'file_id': 'test.pdf', 'base64': MOCK_DOCUMENT_BASE64}]
+MOCK_EMPTY_FILES = [{'filename': 'empty.txt'}]  # No 'base64' or 'content' key
+MOCK_CORRUPT_FILES = [{'file_id': 'corrupt.pdf', 'base64': MOCK_DOCUMENT_BASE64}]
+
+# context and profile returned by the mocked _build_context_and_profile; the service only reads them
+MOCK_FINAL_CONTEXT = "built_context_string"
+MOCK_USER_PROFILE = {"id": MOCK_LOCAL_USER_ID, "name": "Test User"}
+
+# arguments init_context must forward when it rebuilds the context
+EXPECTED_PREPARE_CONTEXT_KWARGS = {
+    'company_short_name': MOCK_COMPANY_SHORT_NAME,
+    'user_identifier': str(MOCK_LOCAL_USER_ID),
+}
+EXPECTED_SET_CONTEXT_KWARGS = {
+    'company_short_name': MOCK_COMPANY_SHORT_NAME,
+    'user_identifier': str(MOCK_LOCAL_USER_ID),
+    'model': "gpt-test-model",
+}
+
 
 class TestQueryService:
     """
@@ -30,55 +55,51 @@ class TestQueryService:
     """
 
     @pytest.fixture(autouse=True)
-    def setup_method(self):
+    def setup_method(self, spec_mock):
         """Set up a consistent, mocked environment for each test."""
         # --- Mocks para todas las dependencias ---
-        self.mock_llm_client = MagicMock(spec=llmClient)
-        self.mock_profile_service = MagicMock(spec=ProfileService)
-        self.mock_document_service = MagicMock()
-        self.mock_llmquery_repo = MagicMock()
-        self.mock_profile_repo = MagicMock(spec=ProfileRepo)
-        self.mock_prompt_service = MagicMock(spec=PromptService)
-        self.company_context_service = MagicMock(spec=ConfigurationService)
-        self.mock_configuration_service = MagicMock(spec=ConfigurationService)
-        self.mock_util = MagicMock(spec=Utility)
-        self.mock_dispatcher = MagicMock(spec=Dispatcher)
-        self.mock_session_context = MagicMock(spec=UserSessionContextService)
-        self.mock_i18n_service = MagicMock(spec=I18nService)
+        # specced mocks; the class specs are read once per session
+        self.mock_llm_client = spec_mock(llmClient)
+        self.mock_profile_service = spec_mock(ProfileService)
+        # plain Mocks: no test needs magic methods from these
+        self.mock_document_service = Mock()
+        self.mock_llmquery_repo = Mock()
+        self.mock_profile_repo = spec_mock(ProfileRepo)
+        self.mock_prompt_service = spec_mock(PromptService)
+        self.company_context_service = spec_mock(ConfigurationService)
+        self.mock_configuration_service = spec_mock(ConfigurationService)
+        self.mock_util = spec_mock(Utility)
+        self.mock_dispatcher = spec_mock(Dispatcher)
+        self.mock_session_context = spec_mock(UserSessionContextService)
+        self.mock_i18n_service = spec_mock(I18nService)
 
 
         # --- Instancia del servicio bajo prueba ---
-        with patch.dict(os.environ, {"LLM_MODEL": "gpt-test"}):
-            self.service = QueryService(
-                llm_client=self.mock_llm_client,
-                company_context_service=self.company_context_service,
-                profile_service=self.mock_profile_service,
-                document_service=self.mock_document_service,
-                document_repo=MagicMock(),
-                llmquery_repo=self.mock_llmquery_repo,
-                profile_repo=self.mock_profile_repo,
-                prompt_service=self.mock_prompt_service,
-                i18n_service=self.mock_i18n_service,
-                util=self.mock_util,
-                dispatcher=self.mock_dispatcher,
-                session_context=self.mock_session_context,
-                configuration_service=self.mock_configuration_service
-            )
-
-        self.mock_i18n_service.t.side_effect = lambda key, **kwargs: f"translated:{key}"
+        self.service = QueryService(
+            llm_client=self.mock_llm_client,
+            company_context_service=self.company_context_service,
+            profile_service=self.mock_profile_service,
+            document_service=self.mock_document_service,
+            document_repo=Mock(),
+            llmquery_repo=self.mock_llmquery_repo,
+            profile_repo=self.mock_profile_repo,
+            prompt_service=self.mock_prompt_service,
+            i18n_service=self.mock_i18n_service,
+            util=self.mock_util,
+            dispatcher=self.mock_dispatcher,
+            session_context=self.mock_session_context,
+            configuration_service=self.mock_configuration_service
+        )
 
-        self.mock_company = Company(id=1, short_name=MOCK_COMPANY_SHORT_NAME)
+        self.mock_company = MOCK_COMPANY
         self.mock_profile_repo.get_company_by_short_name.return_value = self.mock_company
 
         # Mock para el método interno que hace la E/S de disco
-        self.mock_final_context = "built_context_string"
-        self.mock_user_profile = {"id": MOCK_LOCAL_USER_ID, "name": "Test User"}
-        self.service._build_context_and_profile = MagicMock(
+        self.mock_final_context = MOCK_FINAL_CONTEXT
+        self.mock_user_profile = MOCK_USER_PROFILE
+        self.service._build_context_and_profile = Mock(
             return_value=(self.mock_final_context, self.mock_user_profile))
 
-        # Base64 content for file loading tests
-        self.base64_content = base64.b64encode(b'document content')
-
     # --- Tests para prepare_context ---
 
     def test_prepare_context_rebuild_not_needed(self):
@@ -179,17 +200,10 @@ class TestQueryService:
         )
 
         # 2. Se debe haber llamado a prepare_context
-        mock_prepare.assert_called_once_with(
-            company_short_name=MOCK_COMPANY_SHORT_NAME,
-            user_identifier=str(MOCK_LOCAL_USER_ID)
-        )
+        mock_prepare.assert_called_once_with(**EXPECTED_PREPARE_CONTEXT_KWARGS)
 
         # 3. Se debe haber llamado a set_context_for_llm
-        mock_set_context.assert_called_once_with(
-            company_short_name=MOCK_COMPANY_SHORT_NAME,
-            user_identifier=str(MOCK_LOCAL_USER_ID),
-            model="gpt-test-model"
-        )
+        mock_set_context.assert_called_once_with(**EXPECTED_SET_CONTEXT_KWARGS)
 
         # 4. El resultado debe ser el devuelto por set_context_for_llm
         assert result == {'response_id': 'new_id_123'}
@@ -240,9 +254,7 @@ class TestQueryService:
     def test_load_files_for_context_builds_correctly(self):
         """Prueba que el contexto de archivos se construye correctamente."""
         self.mock_document_service.file_to_txt.return_value = "Text from file"
-        files = [{'file_id': 'test.pdf', 'base64': self.base64_content.decode('utf-8')}]
-
-        result = self.service.load_files_for_context(files)
+        result = self.service.load_files_for_context(MOCK_PDF_FILES)
 
         self.mock_document_service.file_to_txt.assert_called_once()
         assert "<document name='test.pdf'>\nText from file\n</document>" in result
@@ -250,9 +262,7 @@ class TestQueryService:
 
     def test_load_files_for_context_handles_missing_content(self):
         """Prueba que se maneja un archivo sin contenido (solo nombre)."""
-        files = [{'filename': 'empty.txt'}]  # No 'base64' or 'content' key
-
-        result = self.service.load_files_for_context(files)
+        result = self.service.load_files_for_context(MOCK_EMPTY_FILES)
 
         assert "<error>El archivo 'empty.txt' no fue encontrado y no pudo ser cargado.</error>" in result
         self.mock_document_service.file_to_txt.assert_not_called()
@@ -260,8 +270,6 @@ class TestQueryService:
     def test_load_files_for_context_handles_processing_error(self):
         """Prueba que se captura una excepción durante el procesamiento del archivo."""
         self.mock_document_service.file_to_txt.side_effect = Exception("PDF rendering failed")
-        files = [{'file_id': 'corrupt.pdf', 'base64': self.base64_content.decode('utf-8')}]
-
-        result = self.service.load_files_for_context(files)
+        result = self.service.load_files_for_context(MOCK_CORRUPT_FILES)
 
         assert "<error>Error al procesar el archivo corrupt.pdf: PDF rendering failed</error>" in result
\ No newline at end of file
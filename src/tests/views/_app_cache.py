@@ -0,0 +1,48 @@
+# Copyright (c) 2024 Fernando Libedinsky
+# Product: IAToolkit
+#
+# IAToolkit is open source software.
+
+from functools import lru_cache
+from flask import Flask
+from flask.views import View
+
+# services injected in the views of the cached apps, set by the running test
+_current_services = {}
+
+
+def use_services(**services):
+    """
+    Sets the services that the views of the cached apps receive in their constructor.
+    Views are instantiated per request, so each test only needs to call this with its own mocks.
+    """
+    _current_services.clear()
+    _current_services.update(services)
+
+
+def _bind_view(view_cls):
+    def view_func(**kwargs):
+        return view_cls(**_current_services).dispatch_request(**kwargs)
+    return view_func
+
+
+@lru_cache(maxsize=None)
+def make_app(*routes: tuple) -> Flask:
+    """
+    Builds a testing Flask app once per distinct set of routes and caches it.
+
+    Each route is a tuple (rule, endpoint, view, methods). `view` can be a View
+    subclass, that is instantiated with the services set by use_services(),
+    or a plain view function.
+    """
+    app = Flask(__name__)
+    # templates are never reloaded from disk during a test run
+    app.config.from_mapping(TESTING=True, SECRET_KEY="test-secret", PROPAGATE_EXCEPTIONS=True,
+                            TEMPLATES_AUTO_RELOAD=False)
+
+    for rule, endpoint, view, methods in routes:
+        if isinstance(view, type) and issubclass(view, View):
+            view = _bind_view(view)
+        app.add_url_rule(rule, endpoint=endpoint, view_func=view, methods=list(methods))
+
+    return app
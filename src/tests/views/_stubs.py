@@ -0,0 +1,14 @@
+# Copyright (c) 2024 Fernando Libedinsky
+# Product: IAToolkit
+#
+# IAToolkit is open source software.
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class CompanyStub:
+    """Plain stand-in for the Company model, for views that only check that a company was found."""
+    id: int
+    name: str
+    short_name: str
@@ -0,0 +1,161 @@
+# Copyright (c) 2024 Fernando Libedinsky
+# Product: IAToolkit
+#
+# IAToolkit is open source software.
+
+import pytest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+from iatoolkit.views import base_login_view
+from iatoolkit.views.base_login_view import BaseLoginView
+from iatoolkit.views.embedding_api_view import EmbeddingApiView
+from iatoolkit.views.external_login_view import ExternalLoginView, RedeemTokenApiView
+from iatoolkit.views.forgot_password_view import ForgotPasswordView
+from iatoolkit.services.profile_service import ProfileService
+from iatoolkit.services.auth_service import AuthService
+from iatoolkit.services.jwt_service import JWTService
+from iatoolkit.services.branding_service import BrandingService
+from iatoolkit.services.prompt_manager_service import PromptService
+from iatoolkit.services.configuration_service import ConfigurationService
+from iatoolkit.services.query_service import QueryService
+from iatoolkit.services.i18n_service import I18nService
+from iatoolkit.common.util import Utility
+from ._app_cache import make_app
+
+VIEWS_TESTS_DIR = Path(__file__).parent
+
+
+# This endpoint is needed for url_for() to work inside the external login view
+def fake_finalize(company_short_name, token):
+    return "finalize page", 200
+
+
+# endpoints the forgot password view redirects to or builds links for
+def fake_home(company_short_name):
+    return "home page", 200
+
+
+def fake_change_password(company_short_name, token):
+    return "change password page", 200
+
+
+# routes registered in the app shared by the whole test session
+SHARED_ROUTES = (
+    ("/<company_short_name>/api/embedding", "embedding_api", EmbeddingApiView, ("POST",)),
+    ("/<company_short_name>/external_login", "external_login", ExternalLoginView, ("POST",)),
+    ("/<company_short_name>/finalize/<token>", "finalize_with_token", fake_finalize, ("GET",)),
+    ("/<company_short_name>/api/redeem_token", "redeem_token", RedeemTokenApiView, ("POST",)),
+    ("/<company_short_name>/forgot_password", "forgot_password", ForgotPasswordView, ("GET", "POST")),
+    ("/<company_short_name>/home.html", "home", fake_home, ("GET",)),
+    ("/<company_short_name>/change_password/<token>", "change_password", fake_change_password, ("GET",)),
+)
+
+
+def pytest_configure(config):
+    # keep the marker known when pytest-xdist is not installed
+    config.addinivalue_line("markers", "xdist_group(name): run tests of the same group on one xdist worker")
+
+
+def pytest_collection_modifyitems(items):
+    """
+    Group the view tests by class for pytest-xdist (--dist loadgroup),
+    so class-scoped fixtures like the shared Flask app stay on a single worker.
+    """
+    for item in items:
+        if VIEWS_TESTS_DIR in Path(item.fspath).parents:
+            group = item.cls.__qualname__ if item.cls else Path(item.fspath).stem
+            item.add_marker(pytest.mark.xdist_group(f"{Path(item.fspath).stem}::{group}"))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def secret_key_env():
+    """Secret key read by the views that sign tokens, set once for the whole session."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("IATOOLKIT_SECRET_KEY", "mocked_secret_key")
+        yield
+
+
+@pytest.fixture(scope="session")
+def shared_app():
+    """
+    Flask app shared by the view tests of the whole session.
+    Views get the services of the running test through use_services() or external_login_mocks.
+    """
+    return make_app(*SHARED_ROUTES)
+
+
+@pytest.fixture(scope="class")
+def shared_client(request, shared_app):
+    """Binds the shared app and a single test client to the test class, for its whole run."""
+    request.cls.app = shared_app
+    request.cls.client = shared_app.test_client()
+    return request.cls.client
+
+
+@pytest.fixture(scope="class")
+def routes_app(request):
+    """Binds to the test class the app with the ROUTES of its module, built once for the whole session."""
+    request.cls.app = make_app(*request.module.ROUTES)
+    return request.cls.app
+
+
+@pytest.fixture(scope="class")
+def routes_client(request, routes_app):
+    """Binds routes_app and a cookieless test client to the test class, for the API view tests."""
+    request.cls.client = routes_app.test_client(use_cookies=False)
+    return request.cls.client
+
+
+@pytest.fixture
+def render_template_mock(monkeypatch):
+    """Replaces render_template in the login views with a mock that records the calls."""
+    mock = Mock(return_value="")
+    monkeypatch.setattr(base_login_view, "render_template", mock)
+    return mock
+
+
+# services received by BaseLoginView, used as specs of the login view mocks
+LOGIN_VIEW_SERVICES = {
+    "profile_service": ProfileService,
+    "auth_service": AuthService,
+    "jwt_service": JWTService,
+    "branding_service": BrandingService,
+    "prompt_service": PromptService,
+    "config_service": ConfigurationService,
+    "query_service": QueryService,
+    "i18n_service": I18nService,
+    "utility": Utility,
+}
+
+
+@pytest.fixture(scope="session")
+def login_view_services():
+    """
+    Mocks for the services of BaseLoginView, specced against the real classes.
+    The spec introspection is paid once per session; tests reset them instead of rebuilding.
+    """
+    return SimpleNamespace(**{name: Mock(spec=cls) for name, cls in LOGIN_VIEW_SERVICES.items()})
+
+
+@pytest.fixture(scope="module")
+def login_view_mocks(login_view_services):
+    """
+    Injects the login view mocks in every login view through a constructor
+    patched once per module. Views are instantiated per request, so they
+    always see these mocks.
+    """
+    def patched_base_init(instance, **kwargs):
+        instance.__dict__.update(vars(login_view_services))
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(BaseLoginView, "__init__", patched_base_init)
+        yield login_view_services
+
+
+@pytest.fixture
+def external_login_mocks(login_view_mocks):
+    """The module login view mocks, reset before each test."""
+    for mock in vars(login_view_mocks).values():
+        mock.reset_mock(return_value=True, side_effect=True)
+    return login_view_mocks
@@ -2,10 +2,8 @@
 # IAToolkit is open source software.
 
 import pytest
-from unittest.mock import MagicMock, patch
-from flask import Flask
+from unittest.mock import Mock
 from iatoolkit.views.base_login_view import BaseLoginView
-from iatoolkit.repositories.models import Company  # Import Company for spec
 
 # Constants for test data
 COMPANY_SHORT_NAME = "test-co"
@@ -19,34 +17,32 @@ class TestBaseLoginView:
     def setup_method(self):
         """Set up a new view instance and fresh mocks before each test method runs."""
         self.mock_services = {
-            "profile_service": MagicMock(),
-            "branding_service": MagicMock(),
-            "prompt_service": MagicMock(),
-            "config_service": MagicMock(),
-            "query_service": MagicMock(),
-            "jwt_service": MagicMock(),
-            "auth_service": MagicMock(),
-            "utility": MagicMock(),
-            "i18n_service": MagicMock(),
+            "profile_service": Mock(),
+            "branding_service": Mock(),
+            "prompt_service": Mock(),
+            "config_service": Mock(),
+            "query_service": Mock(),
+            "jwt_service": Mock(),
+            "auth_service": Mock(),
+            "utility": Mock(),
+            "i18n_service": Mock(),
         }
         self.view_instance = BaseLoginView(**self.mock_services)
 
-    def test_handle_login_path_slow_path(self):
+    def test_handle_login_path_slow_path(self, shared_app, render_template_mock):
         """Slow path: should render onboarding_shell.html with correct context."""
         # Arrange
         self.mock_services["query_service"].prepare_context.return_value = {"rebuild_needed": True}
         self.mock_services["branding_service"].get_company_branding.return_value = {"logo": "logo.png"}
         self.mock_services["config_service"].get_configuration.return_value = [{"title": "Card 1"}]
 
-        app = Flask(__name__)
-        with app.test_request_context():
-            with patch("iatoolkit.views.base_login_view.render_template") as mock_rt:
-                # Act: Call with the new signature
-                _ = self.view_instance._handle_login_path(
-                    company_short_name=COMPANY_SHORT_NAME,
-                    user_identifier=USER_IDENTIFIER,
-                    target_url=DUMMY_TARGET_URL
-                )
+        with shared_app.test_request_context():
+            # Act: Call with the new signature
+            _ = self.view_instance._handle_login_path(
+                company_short_name=COMPANY_SHORT_NAME,
+                user_identifier=USER_IDENTIFIER,
+                target_url=DUMMY_TARGET_URL
+            )
 
         # Assert
         self.mock_services["query_service"].prepare_context.assert_called_once_with(
@@ -55,14 +51,14 @@ class TestBaseLoginView:
         self.mock_services["branding_service"].get_company_branding.assert_called_once_with(COMPANY_SHORT_NAME)
         self.mock_services["config_service"].get_configuration.assert_called_once_with(COMPANY_SHORT_NAME, 'onboarding_cards')
 
-        mock_rt.assert_called_once()
-        template_name, ctx = mock_rt.call_args[0], mock_rt.call_args[1]
+        render_template_mock.assert_called_once()
+        template_name, ctx = render_template_mock.call_args[0], render_template_mock.call_args[1]
         assert template_name[0] == "onboarding_shell.html"
         assert ctx["iframe_src_url"] == DUMMY_TARGET_URL
         assert ctx["branding"] == {"logo": "logo.png"}
         assert ctx["onboarding_cards"] == [{"title": "Card 1"}]
 
-    def test_handle_login_path_fast_path_without_token(self):
+    def test_handle_login_path_fast_path_without_token(self, shared_app, render_template_mock):
         """Fast path: should render chat.html with redeem_token as None."""
         # Arrange
         self.mock_services["query_service"].prepare_context.return_value = {"rebuild_needed": False}
@@ -70,15 +66,13 @@ class TestBaseLoginView:
         self.mock_services["prompt_service"].get_user_prompts.return_value = [{"id": "p1"}]
         self.mock_services["config_service"].get_configuration.return_value = []
 
-        app = Flask(__name__)
-        with app.test_request_context():
-            with patch("iatoolkit.views.base_login_view.render_template") as mock_rt:
-                # Act: Call without redeem_token
-                _ = self.view_instance._handle_login_path(
-                    company_short_name=COMPANY_SHORT_NAME,
-                    user_identifier=USER_IDENTIFIER,
-                    target_url=DUMMY_TARGET_URL
-                )
+        with shared_app.test_request_context():
+            # Act: Call without redeem_token
+            _ = self.view_instance._handle_login_path(
+                company_short_name=COMPANY_SHORT_NAME,
+                user_identifier=USER_IDENTIFIER,
+                target_url=DUMMY_TARGET_URL
+            )
 
         # Assert
         self.mock_services["query_service"].prepare_context.assert_called_once_with(
@@ -86,14 +80,14 @@ class TestBaseLoginView:
         )
         self.mock_services["prompt_service"].get_user_prompts.assert_called_once_with(COMPANY_SHORT_NAME)
 
-        mock_rt.assert_called_once()
-        template_name, ctx = mock_rt.call_args[0], mock_rt.call_args[1]
+        render_template_mock.assert_called_once()
+        template_name, ctx = render_template_mock.call_args[0], render_template_mock.call_args[1]
         assert template_name[0] == "chat.html"
         assert ctx["branding"] == {"theme": "dark"}
         assert ctx["prompts"] == [{"id": "p1"}]
         assert ctx["redeem_token"] is None
 
-    def test_handle_login_path_fast_path_with_token(self):
+    def test_handle_login_path_fast_path_with_token(self, shared_app, render_template_mock):
         """Fast path: should pass the redeem_token to the chat.html template."""
         # Arrange
         self.mock_services["query_service"].prepare_context.return_value = {"rebuild_needed": False}
@@ -102,18 +96,16 @@ class TestBaseLoginView:
         self.mock_services["config_service"].get_onboarding_cards.return_value = []
         test_token = "test-token-123"
 
-        app = Flask(__name__)
-        with app.test_request_context():
-            with patch("iatoolkit.views.base_login_view.render_template") as mock_rt:
-                # Act: Call with redeem_token
-                _ = self.view_instance._handle_login_path(
-                    company_short_name=COMPANY_SHORT_NAME,
-                    user_identifier=USER_IDENTIFIER,
-                    target_url=DUMMY_TARGET_URL,
-                    redeem_token=test_token
-                )
+        with shared_app.test_request_context():
+            # Act: Call with redeem_token
+            _ = self.view_instance._handle_login_path(
+                company_short_name=COMPANY_SHORT_NAME,
+                user_identifier=USER_IDENTIFIER,
+                target_url=DUMMY_TARGET_URL,
+                redeem_token=test_token
+            )
 
         # Assert
-        mock_rt.assert_called_once()
-        ctx = mock_rt.call_args[1]
+        render_template_mock.assert_called_once()
+        ctx = render_template_mock.call_args[1]
         assert ctx["redeem_token"] == test_token
\ No newline at end of file
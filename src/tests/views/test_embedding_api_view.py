@@ -1,13 +1,14 @@
 # tests/views/test_embedding_api_view.py
 import pytest
-from flask import Flask
-from unittest.mock import MagicMock
+from unittest.mock import Mock, call, create_autospec
 import json
+from types import MappingProxyType
 
-# Import the view and service mocks
+# Import the view under test
 from iatoolkit.views.embedding_api_view import EmbeddingApiView
-from iatoolkit.services.embedding_service import EmbeddingService
 from iatoolkit.services.auth_service import AuthService
+from iatoolkit.services.embedding_service import EmbeddingService
+from ._app_cache import use_services
 
 # --- Test Constants ---
 MOCK_COMPANY_SHORT_NAME = "acme-corp"
@@ -16,39 +17,40 @@ MOCK_TEXT_TO_EMBED = "This is a test sentence."
 MOCK_EMBEDDING_B64 = "Abcde12345=="
 MOCK_MODEL_NAME = "test-model-v1"
 
+# request bodies serialized once for the whole module
+EMBED_PAYLOAD_BYTES = json.dumps({"text": MOCK_TEXT_TO_EMBED}).encode()
+MISSING_TEXT_PAYLOAD_BYTES = json.dumps({"wrong_key": "some value"}).encode()
+EMPTY_TEXT_PAYLOAD_BYTES = json.dumps({"text": ""}).encode()
+
+# read-only default auth result, so no test can leak changes into the next one
+DEFAULT_VERIFY_OK = MappingProxyType({"success": True, 'user_identifier': MOCK_USER_IDENTIFIER})
+
+EMBED_URL = f'/{MOCK_COMPANY_SHORT_NAME}/api/embedding'
+
 
 class TestEmbeddingApiView:
     """Test suite for the EmbeddingApiView endpoint."""
 
+    @pytest.fixture(scope="class", autouse=True)
+    def app(self, request, shared_app, shared_client):
+        """
+        Class-level state, built once: the service mocks, next to the
+        session-wide Flask app and test client bound by shared_client.
+        """
+        request.cls.mock_auth_service = Mock()
+        request.cls.mock_embedding_service = Mock()
+        return shared_app
+
     @pytest.fixture(autouse=True)
     def setup_method(self):
-        """Set up a clean Flask test environment before each test."""
-        self.app = Flask(__name__)
-        self.app.testing = True
-        self.client = self.app.test_client()
-        self.url = f'/{MOCK_COMPANY_SHORT_NAME}/api/embedding'
-
-        # Create mocks for the injected services
-        self.mock_auth_service = MagicMock(spec=AuthService)
-        self.mock_embedding_service = MagicMock(spec=EmbeddingService)
-
-        # Register the view with the Flask app, injecting the mocks
-        view_func = EmbeddingApiView.as_view(
-            'embedding_api',
-            auth_service=self.mock_auth_service,
-            embedding_service=self.mock_embedding_service
-        )
-        self.app.add_url_rule(
-            '/<company_short_name>/api/embedding',
-            view_func=view_func,
-            methods=['POST']
-        )
+        """Reset the class mocks and inject them in the view before each test."""
+        self.mock_auth_service.reset_mock(return_value=True, side_effect=True)
+        self.mock_embedding_service.reset_mock(return_value=True, side_effect=True)
+        use_services(auth_service=self.mock_auth_service,
+                     embedding_service=self.mock_embedding_service)
 
         # Default successful authentication for most tests
-        self.mock_auth_service.verify.return_value = {
-            "success": True,
-            'user_identifier': MOCK_USER_IDENTIFIER
-        }
+        self.mock_auth_service.verify.return_value = DEFAULT_VERIFY_OK
 
     def test_generate_embedding_success(self):
         """
@@ -58,25 +60,47 @@ class TestEmbeddingApiView:
         # Arrange: Configure the mock service to return expected values
         self.mock_embedding_service.embed_text.return_value = MOCK_EMBEDDING_B64
         self.mock_embedding_service.get_model_name.return_value = MOCK_MODEL_NAME
-        payload = {"text": MOCK_TEXT_TO_EMBED}
 
-        # Act: Make the POST request
-        response = self.client.post(self.url, json=payload)
+        # Act: dispatch the view directly, without going through the test client
+        with self.app.test_request_context(EMBED_URL, method="POST",
+                                           data=EMBED_PAYLOAD_BYTES, content_type="application/json"):
+            view = EmbeddingApiView(auth_service=self.mock_auth_service,
+                                    embedding_service=self.mock_embedding_service)
+            response, status_code = view.dispatch_request(company_short_name=MOCK_COMPANY_SHORT_NAME)
 
         # Assert: Check the response and service calls
-        assert response.status_code == 200
+        assert status_code == 200
         assert response.json == {
             "embedding": MOCK_EMBEDDING_B64,
             "model": MOCK_MODEL_NAME
         }
 
-        self.mock_auth_service.verify.assert_called_once()
-        self.mock_embedding_service.embed_text.assert_called_once_with(
-            text=MOCK_TEXT_TO_EMBED,
-            company_short_name=MOCK_COMPANY_SHORT_NAME,
-            to_base64=True
-        )
-        self.mock_embedding_service.get_model_name.assert_called_once_with(MOCK_COMPANY_SHORT_NAME)
+        assert self.mock_auth_service.verify.call_count == 1
+        assert self.mock_embedding_service.embed_text.call_count == 1
+        assert self.mock_embedding_service.embed_text.call_args.kwargs == {
+            "text": MOCK_TEXT_TO_EMBED,
+            "company_short_name": MOCK_COMPANY_SHORT_NAME,
+            "to_base64": True
+        }
+        assert self.mock_embedding_service.get_model_name.call_args_list == [call(MOCK_COMPANY_SHORT_NAME)]
+
+    def test_contract_matches_spec(self):
+        """
+        The per-test mocks are not spec'd, so this test runs the happy path once
+        with autospecced mocks, which also check the call signatures, to catch
+        drift between the view and the real services.
+        """
+        mock_auth_service = create_autospec(AuthService, instance=True)
+        mock_embedding_service = create_autospec(EmbeddingService, instance=True)
+        use_services(auth_service=mock_auth_service, embedding_service=mock_embedding_service)
+        mock_auth_service.verify.return_value = DEFAULT_VERIFY_OK
+        mock_embedding_service.embed_text.return_value = MOCK_EMBEDDING_B64
+        mock_embedding_service.get_model_name.return_value = MOCK_MODEL_NAME
+
+        response = self.client.post(EMBED_URL, data=EMBED_PAYLOAD_BYTES, content_type="application/json")
+
+        assert response.status_code == 200
+        mock_embedding_service.embed_text.assert_called_once()
 
     def test_generate_embedding_auth_failure(self):
         """
@@ -89,37 +113,28 @@ class TestEmbeddingApiView:
             "error": "Invalid session",
             "status_code": 401
         }
-        payload = {"text": "any text"}
 
         # Act
-        response = self.client.post(self.url, json=payload)
+        response = self.client.post(EMBED_URL, data=EMBED_PAYLOAD_BYTES, content_type="application/json")
 
         # Assert
         assert response.status_code == 401
         assert response.json['error'] == "Invalid session"
         self.mock_embedding_service.embed_text.assert_not_called()
 
-    def test_generate_embedding_not_json(self):
-        """Tests that the endpoint returns a 400 error if the request body is not JSON."""
-        # Act
-        response = self.client.post(self.url, data="this is not json")
-
-        # Assert
-        assert response.status_code == 400
-        assert response.json['error'] == "Request must be JSON"
-        self.mock_embedding_service.embed_text.assert_not_called()
-
-    def test_generate_embedding_missing_text_key(self):
-        """Tests that the endpoint returns a 400 error if the 'text' key is missing from the JSON payload."""
-        # Arrange
-        payload = {"wrong_key": "some value"}
-
+    @pytest.mark.parametrize("body, content_type, expected_error", [
+        (b"this is not json", None, "Request must be JSON"),
+        (MISSING_TEXT_PAYLOAD_BYTES, "application/json", "The 'text' key is required."),
+        (EMPTY_TEXT_PAYLOAD_BYTES, "application/json", "The 'text' key is required."),
+    ], ids=["not_json", "missing_text_key", "empty_text"])
+    def test_generate_embedding_bad_input_returns_400(self, body, content_type, expected_error):
+        """Tests that the endpoint returns a 400 error when the body is not JSON or has no text to embed."""
         # Act
-        response = self.client.post(self.url, json=payload)
+        response = self.client.post(EMBED_URL, data=body, content_type=content_type)
 
         # Assert
         assert response.status_code == 400
-        assert response.json['error'] == "The 'text' key is required."
+        assert response.json['error'] == expected_error
         self.mock_embedding_service.embed_text.assert_not_called()
 
     def test_generate_embedding_unexpected_service_exception(self):
@@ -129,10 +144,9 @@ class TestEmbeddingApiView:
         """
         # Arrange
         self.mock_embedding_service.embed_text.side_effect = Exception("Model failed to load")
-        payload = {"text": MOCK_TEXT_TO_EMBED}
 
         # Act
-        response = self.client.post(self.url, json=payload)
+        response = self.client.post(EMBED_URL, data=EMBED_PAYLOAD_BYTES, content_type="application/json")
 
         # Assert
         assert response.status_code == 500
@@ -1,150 +1,123 @@
 # tests/views/test_external_login_view.py
+import json
 import pytest
-from flask import Flask
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock
 from iatoolkit.views.external_login_view import ExternalLoginView, RedeemTokenApiView
 from iatoolkit.views.base_login_view import BaseLoginView
 
+COMPANY_SHORT_NAME = "acme"
+USER_IDENTIFIER = "ext-123"
+EXTERNAL_LOGIN_URL = f"/{COMPANY_SHORT_NAME}/external_login"
+REDEEM_TOKEN_URL = f"/{COMPANY_SHORT_NAME}/api/redeem_token"
+
+# request bodies serialized once for the whole module
+VALID_BODY_BYTES = json.dumps({"user_identifier": USER_IDENTIFIER}).encode()
+EMPTY_USER_BODY_BYTES = json.dumps({"user_identifier": ""}).encode()
+EMPTY_BODY_BYTES = b"{}"
+
+
 # --- Tests for ExternalLoginView ---
+@pytest.mark.usefixtures("shared_client")
 class TestExternalLoginView:
     @pytest.fixture(autouse=True)
-    def setup_method(self, monkeypatch):
-        self.app = Flask(__name__)
-        self.client = self.app.test_client()
-
+    def setup_method(self, external_login_mocks):
         # Mocks for all services that could be used by the view or its parent
-        self.auth_service = MagicMock()
-        self.profile_service = MagicMock()
-        self.jwt_service = MagicMock()
-        self.branding_service = MagicMock()
-        self.onboarding_service = MagicMock()
-        self.query_service = MagicMock()
-        self.prompt_service = MagicMock()
-
-        # A single, comprehensive patch for the parent constructor
-        def patched_base_init(instance, **kwargs):
-            instance.auth_service = self.auth_service
-            instance.profile_service = self.profile_service
-            instance.jwt_service = self.jwt_service
-            instance.branding_service = self.branding_service
-            instance.onboarding_service = self.onboarding_service
-            instance.query_service = self.query_service
-            instance.prompt_service = self.prompt_service
-        monkeypatch.setattr(BaseLoginView, "__init__", patched_base_init)
-
-        # Register view under test
-        self.app.add_url_rule(
-            "/<company_short_name>/external_login",
-            view_func=ExternalLoginView.as_view("external_login"),
-            methods=["POST"],
-        )
-        # This endpoint is needed for url_for() to work inside the view
-        @self.app.route("/<company_short_name>/finalize/<token>", endpoint="finalize_with_token")
-        def fake_finalize(company_short_name, token):
-            return "finalize page", 200
+        self.auth_service = external_login_mocks.auth_service
+        self.profile_service = external_login_mocks.profile_service
+        self.jwt_service = external_login_mocks.jwt_service
 
         # Common test data
-        self.company_short_name = "acme"
-        self.user_identifier = "ext-123"
+        self.company_short_name = COMPANY_SHORT_NAME
+        self.user_identifier = USER_IDENTIFIER
 
         # Default success cases for mocks
-        self.profile_service.get_company_by_short_name.return_value = MagicMock(short_name=self.company_short_name)
+        self.profile_service.get_company_by_short_name.return_value = Mock(short_name=self.company_short_name)
         self.auth_service.verify.return_value = {"success": True, "status_code": 401}
         self.jwt_service.generate_chat_jwt.return_value = "fake-redeem-token"
 
-    def test_company_not_found_returns_404(self):
-        self.profile_service.get_company_by_short_name.return_value = None
-        resp = self.client.post(f"/{self.company_short_name}/external_login", json={"user_identifier": "any"})
-        assert resp.status_code == 404
-
-    def test_empty_external_user_id_returns_404(self):
-        self.auth_service.verify.return_value = {"success": False, "status_code": 403, "error": "denied"}
-
-        resp = self.client.post(f"/{self.company_short_name}/external_login", json={"user_identifier": ""})
-        assert resp.status_code == 403
-
-    def test_auth_failure_returns_401(self):
-        self.auth_service.verify.return_value = {"success": False, "status_code": 401, "error": "denied"}
-        resp = self.client.post(
-            f"/{self.company_short_name}/external_login",
-            json={"user_identifier": self.user_identifier},
-        )
-        assert resp.status_code == 401
-
-    def test_success_delegates_to_base_handler(self):
+    # mock conditions of the error paths, applied on top of the default success mocks
+    ERROR_SETUPS = {
+        "company_none": lambda t: setattr(t.profile_service.get_company_by_short_name, "return_value", None),
+        "auth_denied": lambda t: setattr(t.auth_service.verify, "return_value",
+                                         {"success": False, "status_code": 403, "error": "denied"}),
+        "auth_fail": lambda t: setattr(t.auth_service.verify, "return_value",
+                                       {"success": False, "status_code": 401, "error": "denied"}),
+        "no_redeem_token": lambda t: setattr(t.jwt_service.generate_chat_jwt, "return_value", None),
+    }
+
+    @pytest.mark.parametrize("body, mock_setup, expected_status", [
+        (VALID_BODY_BYTES, "company_none", 404),
+        (EMPTY_USER_BODY_BYTES, "auth_denied", 403),
+        (VALID_BODY_BYTES, "auth_fail", 401),
+        (VALID_BODY_BYTES, "no_redeem_token", 403),
+    ], ids=["company_not_found", "empty_external_user_id", "auth_failure", "no_redeem_token"])
+    def test_error_paths(self, body, mock_setup, expected_status):
+        self.ERROR_SETUPS[mock_setup](self)
+
+        # pure branching: dispatch the view directly, without the WSGI round-trip
+        with self.app.test_request_context(EXTERNAL_LOGIN_URL, method="POST",
+                                           data=body, content_type="application/json"):
+            resp = self.app.make_response(
+                ExternalLoginView().dispatch_request(company_short_name=COMPANY_SHORT_NAME))
+        assert resp.status_code == expected_status
+
+    def test_success_delegates_to_base_handler(self, monkeypatch):
         """On success, the view should call the base handler with correct args."""
-        with patch.object(BaseLoginView, "_handle_login_path") as mock_handle_path:
-            mock_handle_path.return_value = "OK", 200
+        mock_handle_path = Mock(return_value=("OK", 200))
+        monkeypatch.setattr(BaseLoginView, "_handle_login_path", mock_handle_path)
 
-            resp = self.client.post(
-                f"/{self.company_short_name}/external_login",
-                json={"user_identifier": self.user_identifier},
-            )
+        # dispatch the view directly, without going through the test client
+        with self.app.test_request_context(EXTERNAL_LOGIN_URL, method="POST",
+                                           data=VALID_BODY_BYTES, content_type="application/json"):
+            result = ExternalLoginView().dispatch_request(company_short_name=COMPANY_SHORT_NAME)
 
-            assert resp.status_code == 200
-            assert resp.data == b"OK"
-            self.profile_service.create_external_user_profile_context.assert_called_once()
-            self.jwt_service.generate_chat_jwt.assert_called_once()
-            mock_handle_path.assert_called_once()
+        assert result == ("OK", 200)
+        self.profile_service.create_external_user_profile_context.assert_called_once()
+        self.jwt_service.generate_chat_jwt.assert_called_once()
+        mock_handle_path.assert_called_once()
 
 
-    def test_handle_path_exception_returns_500_json(self):
+    def test_handle_path_exception_returns_500_json(self, monkeypatch):
         """If _handle_login_path fails, it should return a 500 JSON error."""
-        with patch.object(BaseLoginView, "_handle_login_path", side_effect=Exception("boom")):
-            resp = self.client.post(
-                f"/{self.company_short_name}/external_login",
-                json={"user_identifier": self.user_identifier},
-            )
+        def failing_handle_login_path(*args, **kwargs):
+            raise Exception("boom")
+        monkeypatch.setattr(BaseLoginView, "_handle_login_path", failing_handle_login_path)
+        resp = self.client.post(
+            EXTERNAL_LOGIN_URL,
+            data=VALID_BODY_BYTES, content_type="application/json",
+        )
         assert resp.status_code == 500
         assert resp.is_json
         assert "Internal server error" in resp.get_json().get("error", "")
 
 
 # --- Tests for RedeemTokenApiView (separated for clarity) ---
+@pytest.mark.usefixtures("shared_client")
 class TestRedeemTokenApiView:
     @pytest.fixture(autouse=True)
-    def setup_method(self, monkeypatch):
-        self.app = Flask(__name__)
-        self.client = self.app.test_client()
-        self.auth_service = MagicMock()
-
-        # Use the same patching strategy for consistency
-        def patched_base_init(instance, **kwargs):
-            instance.auth_service = self.auth_service
-            instance.profile_service = MagicMock()
-            instance.jwt_service = MagicMock()
-        monkeypatch.setattr(BaseLoginView, "__init__", patched_base_init)
-
-        self.app.add_url_rule(
-            "/<company_short_name>/api/redeem_token",
-            view_func=RedeemTokenApiView.as_view("redeem_token"),
-            methods=["POST"],
-        )
-        self.company_short_name = "acme"
+    def setup_method(self, external_login_mocks):
+        self.auth_service = external_login_mocks.auth_service
+        self.company_short_name = COMPANY_SHORT_NAME
 
     def test_redeem_missing_token_returns_400(self):
-        resp = self.client.post(f"/{self.company_short_name}/api/redeem_token", json={})
+        with self.app.test_request_context(REDEEM_TOKEN_URL, method="POST",
+                                           data=EMPTY_BODY_BYTES, content_type="application/json"):
+            resp = self.app.make_response(
+                RedeemTokenApiView().dispatch_request(company_short_name=COMPANY_SHORT_NAME))
         assert resp.status_code == 400
         assert "missing validation token" in resp.get_json().get("error", "")
 
-    def test_redeem_failure_returns_401(self):
-        self.auth_service.redeem_token_for_session.return_value = {'success': False, 'error': 'Token es inválido'}
-        resp = self.client.post(
-            f"/{self.company_short_name}/api/redeem_token", json={"token": "bad"}
-        )
-        assert resp.status_code == 401
-        assert "Token es inválido" in resp.get_json().get("error", "")
-        self.auth_service.redeem_token_for_session.assert_called_once_with(
-            company_short_name=self.company_short_name, token="bad"
-        )
+    @pytest.mark.parametrize("token, redeem_result, expected_status, expected_json", [
+        ("bad", {'success': False, 'error': 'Token es inválido'}, 401, {"error": "Token es inválido"}),
+        ("good", {'success': True}, 200, {"status": "ok"}),
+    ], ids=["failure", "success"])
+    def test_redeem_token(self, token, redeem_result, expected_status, expected_json):
+        self.auth_service.redeem_token_for_session.return_value = redeem_result
 
-    def test_redeem_success_returns_200(self):
-        self.auth_service.redeem_token_for_session.return_value = {'success': True}
-        resp = self.client.post(
-            f"/{self.company_short_name}/api/redeem_token", json={"token": "good"}
-        )
-        assert resp.status_code == 200
-        assert resp.get_json().get("status") == "ok"
+        resp = self.client.post(REDEEM_TOKEN_URL, json={"token": token})
+
+        assert resp.status_code == expected_status
+        assert resp.get_json() == expected_json
         self.auth_service.redeem_token_for_session.assert_called_once_with(
-            company_short_name=self.company_short_name, token="good"
-        )
\ No newline at end of file
+            company_short_name=self.company_short_name, token=token
+        )
@@ -1,45 +1,54 @@
+import json
 import pytest
-from flask import Flask
-from unittest.mock import MagicMock
 from iatoolkit.views.llmquery_api_view import LLMQueryApiView
 from iatoolkit.services.query_service import QueryService
 from iatoolkit.services.auth_service import AuthService
 from iatoolkit.services.profile_service import ProfileService
 from iatoolkit.repositories.models import Company
 from iatoolkit.services.i18n_service import I18nService
+from ._app_cache import use_services
 
 MOCK_COMPANY_SHORT_NAME = "test-api-comp"
 MOCK_EXTERNAL_USER_ID = "api-user-789"
 
+# request bodies serialized once for the whole module
+QUERY_BODY_BYTES = json.dumps({"external_user_id": MOCK_EXTERNAL_USER_ID, "model": 'gpt-5'}).encode()
+USER_BODY_BYTES = json.dumps({"external_user_id": MOCK_EXTERNAL_USER_ID}).encode()
+ANY_USER_BODY_BYTES = json.dumps({"user_identifier": "any"}).encode()
+EMPTY_BODY_BYTES = b"{}"
 
+ROUTES = (
+    ('/<company_short_name>/api/query', 'llm_query_api', LLMQueryApiView, ('POST',)),
+)
+
+
+@pytest.mark.usefixtures("routes_client")
 class TestLLMQueryApiView:
     """Tests for the stateless, API-only LLMQueryApiView."""
 
-    @pytest.fixture(autouse=True)
-    def setup_method(self):
-        self.app = Flask(__name__)
-        self.client = self.app.test_client()
-        self.mock_auth = MagicMock(spec=AuthService)
-        self.mock_query = MagicMock(spec=QueryService)
-        self.mock_profile = MagicMock(spec=ProfileService)
-        self.mock_i18n_service = MagicMock(spec=I18nService)
+    @pytest.fixture(scope="class")
+    def mock_company(self):
+        """Company shared by the whole class; tests only read its attributes."""
+        return Company(id=1, short_name=MOCK_COMPANY_SHORT_NAME)
 
+    @pytest.fixture(autouse=True)
+    def setup_method(self, spec_mock, mock_company):
+        self.mock_auth = spec_mock(AuthService)
+        self.mock_query = spec_mock(QueryService)
+        self.mock_profile = spec_mock(ProfileService)
+        self.mock_i18n_service = spec_mock(I18nService)
 
         # Common successful auth mock
         self.mock_auth.verify.return_value = {"success": True, 'user_identifier': MOCK_EXTERNAL_USER_ID}
-        self.mock_profile.get_company_by_short_name.return_value = Company(id=1, short_name=MOCK_COMPANY_SHORT_NAME)
-
-        view = LLMQueryApiView.as_view(
-            'llm_query_api',
-            auth_service=self.mock_auth,
-            query_service=self.mock_query,
-            profile_service=self.mock_profile,
-            i18n_service=self.mock_i18n_service
-        )
+        self.mock_profile.get_company_by_short_name.return_value = mock_company
 
         self.mock_i18n_service.t.side_effect = lambda key, **kwargs: f"translated:{key}"
 
-        self.app.add_url_rule('/<company_short_name>/api/query', view_func=view, methods=['POST'])
+        # Services received by the view
+        use_services(auth_service=self.mock_auth,
+                     query_service=self.mock_query,
+                     profile_service=self.mock_profile,
+                     i18n_service=self.mock_i18n_service)
         self.url = f'/{MOCK_COMPANY_SHORT_NAME}/api/query'
 
 
@@ -52,7 +61,7 @@ class TestLLMQueryApiView:
 
         # Act
         response = self.client.post(self.url,
-                                    json={"external_user_id": MOCK_EXTERNAL_USER_ID, "model": 'gpt-5'})
+                                    data=QUERY_BODY_BYTES, content_type="application/json")
 
         # Assert
         assert response.status_code == 200
@@ -74,7 +83,7 @@ class TestLLMQueryApiView:
         self.mock_query.llm_query.return_value = {"error": True, 'error_message': 'some error'}
 
         response = self.client.post(self.url,
-                                    json={"external_user_id": MOCK_EXTERNAL_USER_ID})
+                                    data=USER_BODY_BYTES, content_type="application/json")
 
         # Assert
         assert response.status_code == 407
@@ -85,7 +94,7 @@ class TestLLMQueryApiView:
         """Tests that the view returns a 401 if API Key authentication fails."""
         self.mock_auth.verify.return_value = {"success": False, "error_message": "Invalid API Key", "status_code": 401}
 
-        response = self.client.post(self.url, json={"user_identifier": "any"})
+        response = self.client.post(self.url, data=ANY_USER_BODY_BYTES, content_type="application/json")
 
         assert response.status_code == 401
         assert "Invalid API Key" in response.json['error_message']
@@ -94,5 +103,5 @@ class TestLLMQueryApiView:
     def test_api_query_for_when_no_data(self):
         self.mock_query.llm_query.return_value = {"answer": "Welcome back!"}
 
-        response = self.client.post(self.url, json={})
+        response = self.client.post(self.url, data=EMPTY_BODY_BYTES, content_type="application/json")
         assert response.status_code == 400
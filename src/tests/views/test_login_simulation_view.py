@@ -1,42 +1,38 @@
 import pytest
-from flask import Flask
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 import os
 
 from iatoolkit.views.login_simulation_view import LoginSimulationView
 from iatoolkit.services.profile_service import ProfileService
 from iatoolkit.services.branding_service import BrandingService
+from ._app_cache import use_services
 
+ROUTES = (
+    ("/simulation/<string:company_short_name>", "login_simulation", LoginSimulationView, ("GET",)),
+)
 
+
+@pytest.mark.usefixtures("routes_app")
 class TestLoginSimulationView:
 
     @pytest.fixture(autouse=True)
-    def setup_method(self):
-        """Configura una aplicación Flask mínima y los mocks necesarios para cada prueba."""
-        self.app = Flask(__name__)
+    def setup_method(self, spec_mock):
+        """Configura los mocks necesarios para cada prueba."""
         self.client = self.app.test_client()
 
         # 1. Mock del servicio que la vista necesita
-        self.profile_service = MagicMock(spec=ProfileService)
-        self.branding_service = MagicMock(spec=BrandingService)
+        self.profile_service = spec_mock(ProfileService)
+        self.branding_service = spec_mock(BrandingService)
 
         self.branding_service.get_company_branding.return_value = {}
 
-        # 2. Creamos la función de la vista, inyectando nuestro mock directamente.
-        # El nombre del argumento (profile_service) debe coincidir con el del __init__ de la vista.
-        view_func = LoginSimulationView.as_view(
-            'login_simulation',
+        # 2. Inyectamos los mocks en la vista registrada en la app compartida.
+        # Los nombres de los argumentos deben coincidir con los del __init__ de la vista.
+        use_services(
             profile_service=self.profile_service,
             branding_service=self.branding_service
         )
 
-        # 3. Registramos la vista ya configurada en la aplicación de prueba.
-        self.app.add_url_rule(
-            "/simulation/<string:company_short_name>",
-            view_func=view_func
-        )
-        # --- FIN DE LA SOLUCIÓN ---
-
     @patch("iatoolkit.views.login_simulation_view.render_template")
     @patch.dict(os.environ, {"IATOOLKIT_API_KEY": "test-api-key"})
     def test_get_renders_simulation_template_with_correct_context(self, mock_render_template):
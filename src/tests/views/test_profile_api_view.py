@@ -1,39 +1,42 @@
 # tests/views/test_profile_api_view.py
+import json
 import pytest
-from flask import Flask
-from unittest.mock import MagicMock
 from iatoolkit.views.profile_api_view import UserLanguageApiView
 from iatoolkit.services.auth_service import AuthService
 from iatoolkit.services.profile_service import ProfileService
+from ._app_cache import use_services
 
 # --- Test Constants ---
 MOCK_USER_IDENTIFIER = "user-123@example.com"
 API_URL = "/api/profile/language"
 
+# request bodies serialized once for the whole module
+EN_BODY_BYTES = json.dumps({'language': 'en'}).encode()
+INVALID_LANGUAGE_BODY_BYTES = json.dumps({'language': 'xx'}).encode()
 
+ROUTES = (
+    (API_URL, 'user_language_api', UserLanguageApiView, ('POST',)),
+)
+
+
+@pytest.mark.usefixtures("routes_client")
 class TestUserLanguageApiView:
     """
     Test suite for the UserLanguageApiView endpoint.
     """
 
     @pytest.fixture(autouse=True)
-    def setup_method(self):
+    def setup_method(self, spec_mock):
         """Set up a clean test environment before each test."""
-        self.app = Flask(__name__)
-        self.app.testing = True
-        self.client = self.app.test_client()
-
         # Mocks for the injected services
-        self.mock_auth_service = MagicMock(spec=AuthService)
-        self.mock_profile_service = MagicMock(spec=ProfileService)
+        self.mock_auth_service = spec_mock(AuthService)
+        self.mock_profile_service = spec_mock(ProfileService)
 
-        # Register the view with the mocked dependencies
-        view_func = UserLanguageApiView.as_view(
-            'user_language_api',
+        # Services injected in the view
+        use_services(
             auth_service=self.mock_auth_service,
             profile_service=self.mock_profile_service
         )
-        self.app.add_url_rule(API_URL, view_func=view_func, methods=['POST'])
 
         # By default, assume authentication is successful for most tests
         self.mock_auth_service.verify.return_value = {
@@ -50,7 +53,7 @@ class TestUserLanguageApiView:
         self.mock_profile_service.update_user_language.return_value = {'success': True}
 
         # Act
-        response = self.client.post(API_URL, json={'language': 'en'})
+        response = self.client.post(API_URL, data=EN_BODY_BYTES, content_type='application/json')
 
         # Assert
         assert response.status_code == 200
@@ -74,7 +77,7 @@ class TestUserLanguageApiView:
         }
 
         # Act
-        response = self.client.post(API_URL, json={'language': 'en'})
+        response = self.client.post(API_URL, data=EN_BODY_BYTES, content_type='application/json')
 
         # Assert
         assert response.status_code == 401
@@ -93,7 +96,7 @@ class TestUserLanguageApiView:
         }
 
         # Act
-        response = self.client.post(API_URL, json={'language': 'xx'})
+        response = self.client.post(API_URL, data=INVALID_LANGUAGE_BODY_BYTES, content_type='application/json')
 
         # Assert
         assert response.status_code == 400
@@ -4,126 +4,136 @@
 # IAToolkit is open source software.
 
 import pytest
-from flask import Flask, url_for, get_flashed_messages
-from unittest.mock import MagicMock, patch
+from flask import url_for, get_flashed_messages
+from unittest.mock import MagicMock
 from iatoolkit.services.profile_service import ProfileService
 from iatoolkit.services.branding_service import BrandingService
 from iatoolkit.services.i18n_service import I18nService
+from iatoolkit.views import signup_view
 from iatoolkit.views.signup_view import SignupView
-from iatoolkit.repositories.models import Company
-import os
+from ._app_cache import use_services
+from ._stubs import CompanyStub
 
 
-class TestSignupView:
-    @classmethod
-    def setup_class(cls):
-        cls.patcher = patch.dict(os.environ, {"IATOOLKIT_SECRET_KEY": "mocked_verif_key"})
-        cls.patcher.start()
-
-    @classmethod
-    def teardown_class(cls):
-        cls.patcher.stop()
-
-    @staticmethod
-    def create_app():
-        """Configura la aplicación Flask para pruebas."""
-        app = Flask(__name__)
-        app.config['SECRET_KEY'] = 'test-secret-key'
-        app.testing = True
-        return app
+# rutas dummy con los endpoints a los que redirige la vista
+def dummy_home(company_short_name):
+    return "Página Home", 200
+
+
+def dummy_verify_account(company_short_name, token):
+    return "Página de verificación", 200
+
+
+# formulario de registro válido, compartido por los tests de POST
+SIGNUP_FORM = {
+    "first_name": "Juan", "last_name": "Perez", "email": "juan@email.com",
+    "password": "password123", "confirm_password": "password123"
+}
+
+
+TEST_COMPANY = CompanyStub(id=1, name="Empresa de Prueba", short_name="test_company")
+
+
+ROUTES = (
+    ("/<string:company_short_name>/signup", "signup", SignupView, ("GET", "POST")),
+    ("/<string:company_short_name>/home.html", "home", dummy_home, ("GET",)),
+    ("/<string:company_short_name>/verify/<token>", "verify_account", dummy_verify_account, ("GET",)),
+)
+
+
+class FakeSerializer:
+    """Reemplazo determinístico de URLSafeTimedSerializer."""
+    token = 'some-secure-token'
+
+    def __init__(self, secret_key):
+        self.secret_key = secret_key
+
+    def dumps(self, obj, salt=None):
+        return self.token
+
+
+@pytest.fixture(scope="module", autouse=True)
+def fake_serializer():
+    """URLSafeTimedSerializer reemplazado una sola vez para todo el módulo."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(signup_view, "URLSafeTimedSerializer", FakeSerializer)
+        yield
 
+
+@pytest.fixture(scope="module")
+def render_template_stub():
+    """render_template reemplazado una sola vez para todo el módulo."""
+    stub = MagicMock()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(signup_view, "render_template", stub)
+        yield stub
+
+
+@pytest.mark.usefixtures("routes_app")
+class TestSignupView:
     @pytest.fixture(autouse=True)
-    def setup(self):
+    def setup(self, spec_mock, render_template_stub):
         """Configura el cliente y los mocks antes de cada test."""
-        self.app = self.create_app()
+        render_template_stub.reset_mock(return_value=True, side_effect=True)
+        self.render_template = render_template_stub
+        self.render_template.return_value = "<html></html>"
         self.client = self.app.test_client()
-        self.profile_service = MagicMock(spec=ProfileService)
-        self.branding_service = MagicMock(spec=BrandingService)
-        self.i8n_service = MagicMock(spec=I18nService)
+        self.profile_service = spec_mock(ProfileService)
+        self.branding_service = spec_mock(BrandingService)
+        self.i8n_service = spec_mock(I18nService)
 
-        self.test_company = Company(id=1, name="Empresa de Prueba", short_name="test_company")
+        self.test_company = TEST_COMPANY
         self.profile_service.get_company_by_short_name.return_value = self.test_company
         self.branding_service.get_company_branding.return_value = {"name": "Empresa de Prueba"}
 
         self.i8n_service.t.side_effect = lambda key, **kwargs: f"translated:{key}"
 
-        # Registrar la vista
-        view = SignupView.as_view("signup",
-                                  profile_service=self.profile_service,
-                                  branding_service=self.branding_service,
-                                  i18n_service=self.i8n_service,)
-        self.app.add_url_rule("/<string:company_short_name>/signup", view_func=view, methods=["GET", "POST"])
-
-        # --- CORRECCIÓN: Añadir rutas dummy con los endpoints correctos ---
-        @self.app.route("/<string:company_short_name>/home.html", endpoint="home")
-        def dummy_home(company_short_name):
-            return "Página Home", 200
-
-        @self.app.route("/<string:company_short_name>/verify/<token>", endpoint="verify_account")
-        def dummy_verify_account(company_short_name, token):
-            return "Página de verificación", 200
-
-    @patch("iatoolkit.views.signup_view.render_template")
-    def test_get_when_invalid_company(self, mock_render):
-        self.profile_service.get_company_by_short_name.return_value = None
-        response = self.client.get("/test_company/signup")
-
-        assert response.status_code == 404
-        mock_render.assert_called_once()
+        # Servicios que recibe la vista
+        use_services(profile_service=self.profile_service,
+                     branding_service=self.branding_service,
+                     i18n_service=self.i8n_service)
 
-    @patch("iatoolkit.views.signup_view.render_template")
-    def test_post_when_invalid_company(self, mock_render):
+    @pytest.mark.parametrize("method", ["GET", "POST"])
+    def test_invalid_company_returns_404(self, method):
         self.profile_service.get_company_by_short_name.return_value = None
-        response = self.client.post("/test_company/signup", data={})
+        response = self.client.open("/test_company/signup", method=method)
 
         assert response.status_code == 404
-        mock_render.assert_called_once()
+        self.render_template.assert_called_once()
 
-    @patch("iatoolkit.views.signup_view.render_template")
-    def test_get_signup_page(self, mock_render_template):
-        mock_render_template.return_value = "<html></html>"
+    def test_get_signup_page(self):
+        self.render_template.return_value = "<html></html>"
         response = self.client.get("/test_company/signup")
 
         assert response.status_code == 200
-        mock_render_template.assert_called_once_with(
+        self.render_template.assert_called_once_with(
             'signup.html',
             company_short_name='test_company',
             branding=self.branding_service.get_company_branding.return_value
         )
 
-    @patch("iatoolkit.views.signup_view.render_template")
-    def test_post_with_error(self, mock_render_template):
-        mock_render_template.return_value = "<html></html>"
+    def test_post_with_error(self):
+        self.render_template.return_value = "<html></html>"
         self.profile_service.signup.return_value = {'error': 'El usuario ya existe'}
-        form_data = {
-            "first_name": "Juan", "last_name": "Perez", "email": "test@email.com",
-            "password": "password123", "confirm_password": "password123"
-        }
-
-        response = self.client.post("/test_company/signup", data=form_data)
+        response = self.client.post("/test_company/signup", data=SIGNUP_FORM)
 
         assert response.status_code == 400
-        mock_render_template.assert_called_once_with(
+        self.render_template.assert_called_once_with(
             'signup.html',
             company_short_name='test_company',
             branding=self.branding_service.get_company_branding.return_value,
-            form_data=form_data,
+            form_data=SIGNUP_FORM,
         )
 
-    @patch("iatoolkit.views.signup_view.URLSafeTimedSerializer")
-    def test_post_when_ok(self, mock_serializer_class):
+    def test_post_when_ok(self):
         success_message = "¡Cuenta creada! Revisa tu correo para verificarla."
-        mock_serializer_class.return_value.dumps.return_value = 'some-secure-token'
         self.profile_service.signup.return_value = {"message": success_message}
 
         with self.app.test_request_context():
             expected_redirect_url = url_for('home', company_short_name='test_company')
 
             with self.client:
-                response = self.client.post("/test_company/signup", data={
-                    "first_name": "Juan", "last_name": "Perez", "email": "juan@email.com",
-                    "password": "password123", "confirm_password": "password123"
-                })
+                response = self.client.post("/test_company/signup", data=SIGNUP_FORM)
                 flashed_messages = get_flashed_messages(with_categories=True)
 
                 assert len(flashed_messages) == 1
@@ -132,12 +142,12 @@ class TestSignupView:
                 assert response.status_code == 302
                 assert response.location == expected_redirect_url
 
+        verification_url = self.profile_service.signup.call_args.kwargs['verification_url']
+        assert verification_url.endswith(f"/verify/{FakeSerializer.token}")
 
-
-    @patch("iatoolkit.views.signup_view.render_template")
-    def test_post_unexpected_error(self, mock_render_template):
+    def test_post_unexpected_error(self):
         self.profile_service.signup.side_effect = Exception('an error')
         response = self.client.post("/test_company/signup", data={})
 
         assert response.status_code == 500
-        mock_render_template.assert_called_once()
+        self.render_template.assert_called_once()
@@ -4,46 +4,45 @@
 # IAToolkit is open source software.
 
 import pytest
-from unittest.mock import MagicMock
-from flask import Flask
 from iatoolkit.views.user_feedback_api_view import UserFeedbackApiView
 from iatoolkit.services.user_feedback_service import UserFeedbackService
 from iatoolkit.services.auth_service import AuthService
+from ._app_cache import use_services
 
+ROUTES = (
+    ('/<company_short_name>/api/feedback', 'feedback', UserFeedbackApiView, ('POST',)),
+)
 
-class TestUserFeedbackView:
-    @staticmethod
-    def create_app():
-        app = Flask(__name__)
-        app.testing = True
-        return app
 
+@pytest.mark.usefixtures("routes_client")
+class TestUserFeedbackView:
     @pytest.fixture(autouse=True)
-    def setup(self):
-        self.app = self.create_app()
-        self.client = self.app.test_client()
-        self.feedback_service = MagicMock(spec=UserFeedbackService)
-        self.mock_auth = MagicMock(spec=AuthService)
+    def setup(self, spec_mock):
+        self.feedback_service = spec_mock(UserFeedbackService)
+        self.mock_auth = spec_mock(AuthService)
 
         # Mock a successful authentication by default for most tests
         self.mock_auth.verify.return_value = {"success": True,
                                               'user_identifier': 'an_user'}
 
-        # Register the view with mocked dependencies
-        feedback_view = UserFeedbackApiView.as_view("feedback",
-                                                     user_feedback_service=self.feedback_service,
-                                                     auth_service=self.mock_auth)
-        self.app.add_url_rule('/<company_short_name>/api/feedback',
-                              view_func=feedback_view,
-                              methods=["POST"])
+        # Services received by the view
+        use_services(user_feedback_service=self.feedback_service,
+                     auth_service=self.mock_auth)
         self.url = '/my_company/api/feedback'
 
+    def post_feedback(self, payload):
+        """Dispatches the view directly inside a request context, without the WSGI round-trip."""
+        with self.app.test_request_context(self.url, method='POST', json=payload):
+            view = UserFeedbackApiView(user_feedback_service=self.feedback_service,
+                                       auth_service=self.mock_auth)
+            return self.app.make_response(view.dispatch_request(company_short_name='my_company'))
+
     def test_post_when_auth_error(self):
         """Test that an auth error returns a 401 status."""
         self.mock_auth.verify.return_value = {"success": False,
                                               'error_message': 'error in authentication',
                                               'status_code': 401}
-        response = self.client.post(self.url, json={'message': 'any', 'rating': 1})
+        response = self.post_feedback({'message': 'any', 'rating': 1})
 
         assert response.status_code == 401
         assert response.json["error_message"] == 'error in authentication'
@@ -54,7 +53,7 @@ class TestUserFeedbackView:
         """Test that a 500 is returned if the service throws an unexpected exception."""
         self.feedback_service.new_feedback.side_effect = Exception('Database connection failed')
 
-        response = self.client.post(self.url, json={'message': 'feedback message', 'rating': 4})
+        response = self.post_feedback({'message': 'feedback message', 'rating': 4})
 
         assert response.status_code == 500
         assert 'Database connection failed' in response.json['error_message']
@@ -63,7 +62,7 @@ class TestUserFeedbackView:
         """Test that a 402 is returned if the service reports a business logic error."""
         self.feedback_service.new_feedback.return_value = {'error': 'Company has no credits'}
 
-        response = self.client.post(self.url, json={'message': 'feedback message', 'rating': 3})
+        response = self.post_feedback({'message': 'feedback message', 'rating': 3})
 
         # Assuming 402 is used for business logic failures (like payment required)
         assert response.status_code == 402
@@ -73,7 +72,7 @@ class TestUserFeedbackView:
         """Test the successful path, returning a 200 status."""
         self.feedback_service.new_feedback.return_value = {'message': "Feedback guardado correctamente"}
 
-        response = self.client.post(self.url, json={'message': 'feedback message', 'rating': 5})
+        response = self.post_feedback({'message': 'feedback message', 'rating': 5})
 
         assert response.status_code == 200
         assert response.json == {'message': "Feedback guardado correctamente"}
@@ -4,41 +4,48 @@
 # IAToolkit is open source software.
 
 import pytest
-from flask import Flask, url_for, get_flashed_messages
+from flask import url_for, get_flashed_messages
 from unittest.mock import MagicMock, patch
 from iatoolkit.services.profile_service import ProfileService
 from iatoolkit.services.branding_service import BrandingService
 from iatoolkit.services.i18n_service import I18nService
 from iatoolkit.repositories.models import Company
+from iatoolkit.views import verify_user_view
 from iatoolkit.views.verify_user_view import VerifyAccountView
-import os
 from itsdangerous import SignatureExpired
+from ._app_cache import use_services
 
 
-class TestVerifyAccountView:
-    @classmethod
-    def setup_class(cls):
-        cls.patcher = patch.dict(os.environ, {"IATOOLKIT_SECRET_KEY": "mocked_secret_key"})
-        cls.patcher.start()
-
-    @classmethod
-    def teardown_class(cls):
-        cls.patcher.stop()
-
-    @staticmethod
-    def create_app():
-        app = Flask(__name__)
-        app.testing = True
-        app.config['SECRET_KEY'] = 'test-secret-key'
-        return app
+def dummy_home(company_short_name):
+    return "Página Home", 200
+
+
+ROUTES = (
+    ("/<string:company_short_name>/verify/<token>", "verify_account", VerifyAccountView, ("GET",)),
+    ("/<string:company_short_name>/home.html", "home", dummy_home, ("GET",)),
+)
+
 
+@pytest.fixture(scope="module", autouse=True)
+def render_template_stub():
+    """render_template reemplazado una sola vez para todo el módulo."""
+    stub = MagicMock()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(verify_user_view, "render_template", stub)
+        yield stub
+
+
+@pytest.mark.usefixtures("routes_app")
+class TestVerifyAccountView:
     @pytest.fixture(autouse=True)
-    def setup(self):
-        self.app = self.create_app()
+    def setup(self, spec_mock, render_template_stub):
+        render_template_stub.reset_mock(return_value=True, side_effect=True)
+        render_template_stub.return_value = "<html></html>"
+        self.render_template = render_template_stub
         self.client = self.app.test_client()
-        self.profile_service = MagicMock(spec=ProfileService)
-        self.branding_service = MagicMock(spec=BrandingService)
-        self.i8n_service = MagicMock(spec=I18nService)
+        self.profile_service = spec_mock(ProfileService)
+        self.branding_service = spec_mock(BrandingService)
+        self.i8n_service = spec_mock(I18nService)
 
         self.test_company = Company(id=1, name="Empresa de Prueba", short_name="test_company")
         self.profile_service.get_company_by_short_name.return_value = self.test_company
@@ -47,27 +54,18 @@ class TestVerifyAccountView:
         # Configure the mock to return a real string, not another mock.
         self.i8n_service.t.side_effect = lambda key, **kwargs: f"translated:{key}"
 
-        view = VerifyAccountView.as_view("verify_account",
-                                         profile_service=self.profile_service,
-                                         branding_service=self.branding_service,
-                                         i18n_service=self.i8n_service,)
-        self.app.add_url_rule("/<string:company_short_name>/verify/<token>", view_func=view, methods=["GET"])
-
-        @self.app.route("/<string:company_short_name>/home.html", endpoint="home")
-        def dummy_home(company_short_name):
-            return "Página Home", 200
+        use_services(profile_service=self.profile_service,
+                     branding_service=self.branding_service,
+                     i18n_service=self.i8n_service)
 
-    @patch("iatoolkit.views.verify_user_view.render_template")
-    def test_get_with_invalid_company(self, mock_render):
+    def test_get_with_invalid_company(self):
         self.profile_service.get_company_by_short_name.return_value = None
         response = self.client.get("/test_company/verify/some_token")
         assert response.status_code == 404
 
-    @patch("iatoolkit.views.verify_user_view.render_template")
     @patch("iatoolkit.views.verify_user_view.URLSafeTimedSerializer")
-    def test_get_with_expired_token(self, mock_serializer_class, mock_render_template):
+    def test_get_with_expired_token(self, mock_serializer_class):
         mock_serializer_class.return_value.loads.side_effect = SignatureExpired('error')
-        mock_render_template.return_value = "<html></html>"
 
         with self.client:
             response = self.client.get("/test_company/verify/expired_token")
@@ -77,18 +75,16 @@ class TestVerifyAccountView:
         assert flashed_messages[0][0] == 'error'
 
         assert response.status_code == 400
-        mock_render_template.assert_called_once_with(
+        self.render_template.assert_called_once_with(
             'signup.html',
             company_short_name='test_company',
             branding=self.branding_service.get_company_branding.return_value,
             token='expired_token',
         )
 
-    @patch("iatoolkit.views.verify_user_view.render_template")
     @patch("iatoolkit.views.verify_user_view.URLSafeTimedSerializer")
-    def test_verify_with_error(self, mock_serializer, mock_render_template):
+    def test_verify_with_error(self, mock_serializer):
         mock_serializer.return_value.loads.return_value = "nonexistent@email.com"
-        mock_render_template.return_value = "<html></html>"
         self.profile_service.verify_account.return_value = {'error': 'Enlace inválido'}
 
         with self.client:
@@ -99,7 +95,7 @@ class TestVerifyAccountView:
         assert flashed_messages[0][0] == 'error'
 
         assert response.status_code == 400
-        mock_render_template.assert_called_once_with(
+        self.render_template.assert_called_once_with(
             'signup.html',
             company_short_name='test_company',
             branding=self.branding_service.get_company_branding.return_value,
@@ -124,9 +120,8 @@ class TestVerifyAccountView:
                 assert len(flashed_messages) == 1
                 assert flashed_messages[0][0] == 'success'
 
-    @patch("iatoolkit.views.verify_user_view.render_template")
     @patch("iatoolkit.views.verify_user_view.URLSafeTimedSerializer")
-    def test_get_unexpected_error(self, mock_serializer, mock_render_template):
+    def test_get_unexpected_error(self, mock_serializer):
         mock_serializer.return_value.loads.return_value = "user@example.com"
         self.profile_service.verify_account.side_effect = Exception('an error')
         with self.client: